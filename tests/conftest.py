@@ -0,0 +1,13 @@
+import pytest
+from tnfsh_timetable_core.index.models import IndexResult, GroupIndex
+
+
+@pytest.fixture
+def index_result() -> IndexResult:
+    """不需連網的最小課表索引：高一 101 班與國文科王大明"""
+    return IndexResult(
+        base_url="http://example.com/",
+        root="index.html",
+        class_=GroupIndex(url="_ClassIndex.html", data={"高一": {"101": "C101101.html"}}),
+        teacher=GroupIndex(url="_TeachIndex.html", data={"國文科": {"王大明": "TA01.html"}}),
+    )
@@ -1,7 +1,9 @@
 import asyncio
 import pytest
 from datetime import datetime
+from tnfsh_timetable_core.index import cache
 from tnfsh_timetable_core.index.cache import fetch_with_cache
+from tnfsh_timetable_core.index.crawler import merge_results, reverse_index
 
 @pytest.mark.asyncio
 async def test_fetch_with_cache():
@@ -12,6 +14,19 @@ async def test_fetch_with_cache():
     # print(result.model_dump_json(indent=4))
 
 
+@pytest.mark.asyncio
+async def test_disk_cache_roundtrip(tmp_path, monkeypatch, index_result):
+    """測試索引寫入磁碟後可原樣讀回"""
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(cache, "_memory_cache", None)
+    data = merge_results(index_result, reverse_index(index_result))
+
+    await cache.save_to_disk(data)
+    loaded = await cache.load_from_disk()
+
+    assert loaded == data
+    assert loaded.reverse_index["101"].category == "高一"
+
 
 if __name__ == "__main__":
     asyncio.run(test_fetch_with_cache())
@@ -1,7 +1,8 @@
 import asyncio
 import pytest
-from tnfsh_timetable_core.index.models import IndexResult, GroupIndex, ReverseMap, AllTypeIndexResult
-from tnfsh_timetable_core.index.crawler import reverse_index, fetch_all_index
+from bs4 import BeautifulSoup
+from tnfsh_timetable_core.index.models import IndexResult, GroupIndex, ReverseMap, ReverseIndexResult, AllTypeIndexResult
+from tnfsh_timetable_core.index.crawler import reverse_index, fetch_all_index, parse_html, merge_results
 
 @pytest.mark.asyncio
 async def test_all_index():
@@ -66,6 +67,38 @@ async def test_reverse_index():
     assert result["張三"].url == "TB01.html"
     assert result["張三"].category == "數學科"
 
+
+def test_merge_results(index_result):
+    """測試合併結果沿用既有模型，不重新驗證"""
+    reverse = reverse_index(index_result)
+    assert isinstance(reverse, ReverseIndexResult)
+
+    result = merge_results(index_result, reverse)
+    assert result.index is index_result
+    assert result.reverse_index is reverse
+    assert AllTypeIndexResult.model_validate_json(result.model_dump_json()) == result
+
+
+def test_parse_html():
+    """測試索引頁面的解析"""
+    html = """
+    <table>
+        <tr><td><span>英文科</span></td></tr>
+        <tr>
+            <td><a href="TB01.html">B01 黃大倬</a></td>
+            <td><a href="TB34.html">B34\r\n Evan</a></td>
+        </tr>
+        <tr><td><span>高一</span></td></tr>
+        <tr><td><a href="C101101.html">101</a></td></tr>
+    </table>
+    """
+    result = parse_html(BeautifulSoup(html, "html.parser"), "_TeachIndex.html")
+
+    assert result.url == "_TeachIndex.html"
+    assert result.data["英文科"] == {"黃大倬": "TB01.html", "Evan": "TB34.html"}
+    assert result.data["高一"] == {"101": "C101101.html"}
+
+
 if __name__ == "__main__":
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
     asyncio.run(test_all_index())
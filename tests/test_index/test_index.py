@@ -1,6 +1,18 @@
 import asyncio
+import json
 import pytest
 from tnfsh_timetable_core.index.index import Index
+from tnfsh_timetable_core.index.models import IndexResult, ReverseIndexResult
+from tnfsh_timetable_core.index.crawler import reverse_index
+
+
+def build_index(index_result: IndexResult) -> Index:
+    """以測試索引建立不需連網的 Index"""
+    index = Index()
+    index.index = index_result
+    index.reverse_index = reverse_index(index.index)
+    return index
+
 
 @pytest.mark.asyncio
 async def test_fetch_index():
@@ -18,5 +30,64 @@ async def test_fetch_index():
     assert index_2.index == index.index    
     #print(index.index.model_dump_json(indent=4))
 
+
+@pytest.mark.parametrize("export_type", ["index", "reverse_index", "all"])
+def test_export_json(tmp_path, export_type, index_result):
+    """測試索引資料匯出為 JSON"""
+    index = build_index(index_result)
+    filepath = index.export_json(export_type, filepath=str(tmp_path / "index.json"))
+
+    with open(filepath, encoding="utf-8") as f:
+        data = json.load(f)
+
+    assert "export_time" in data
+    if export_type in ("index", "all"):
+        assert data["index"]["teacher"]["data"]["國文科"]["王大明"] == "TA01.html"
+    if export_type in ("reverse_index", "all"):
+        assert data["reverse_index"]["101"] == {"url": "C101101.html", "category": "高一"}
+
+
+def test_export_json_type(tmp_path, monkeypatch, index_result):
+    """測試匯出類型不分大小寫，且拒絕不支援的類型"""
+    monkeypatch.chdir(tmp_path)
+    index = build_index(index_result)
+    filepath = index.export_json("ALL")
+    assert filepath == "tnfsh_class_table_index_all.json"
+    with open(filepath, encoding="utf-8") as f:
+        data = json.load(f)
+    assert {"index", "reverse_index"} <= data.keys()
+
+    with pytest.raises(ValueError):
+        index.export_json("teacher")
+
+
+def test_reverse_index_category_interned():
+    """測試由 JSON 載入的反查表共用同一個分類字串"""
+    data = '{"王大明": {"url": "TA01.html", "category": "國文科"}, "李小華": {"url": "TA02.html", "category": "國文科"}}'
+    result = ReverseIndexResult.model_validate(json.loads(data))
+    assert result["王大明"].category is result["李小華"].category
+
+
+def test_reverse_map_getitem(index_result):
+    """測試反查表項目可用鍵值存取，未知鍵值拋出 KeyError"""
+    index = build_index(index_result)
+    entry = index.reverse_index["王大明"]
+    assert entry["url"] == "TA01.html"
+    assert entry["category"] == "國文科"
+    with pytest.raises(KeyError):
+        entry["teacher"]
+
+
+@pytest.mark.parametrize("indent", [False, True])
+def test_export_json_indent(tmp_path, indent, index_result):
+    """測試匯出可選擇縮排或精簡格式"""
+    index = build_index(index_result)
+    filepath = index.export_json("index", filepath=str(tmp_path / "index.json"), indent=indent)
+    with open(filepath, encoding="utf-8") as f:
+        text = f.read()
+    assert ("\n" in text) is indent
+    assert json.loads(text)["index"]["root"] == "index.html"
+
+
 if __name__ == "__main__":
     asyncio.run(test_fetch_index())
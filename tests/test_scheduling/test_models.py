@@ -0,0 +1,224 @@
+import pytest
+from tnfsh_timetable_core.scheduling import models
+from tnfsh_timetable_core.scheduling.models import CourseNode, TeacherNode, ClassNode, build_course_node_from_log_dict
+from tnfsh_timetable_core.timetable.models import CourseInfo, CounterPart
+from tnfsh_timetable_core.timetable_slot_log_dict.models import StreakTime
+from tnfsh_timetable_core.timetable_slot_log_dict.timetable_slot_log_dict import TimetableSlotLogDict
+from tnfsh_timetable_core.index.index import Index
+
+
+def build_course(teacher: TeacherNode, cls: ClassNode, weekday: int, period: int) -> CourseNode:
+    time = StreakTime(weekday=weekday, period=period, streak=1)
+    node = CourseNode(
+        time=time,
+        teachers={teacher.teacher_name: teacher},
+        classes={cls.class_code: cls},
+    )
+    teacher.courses[time] = node
+    cls.courses[time] = node
+    return node
+
+
+def test_course_node_hash():
+    """測試課程節點的雜湊值穩定，且相同內容的節點雜湊相同"""
+    teacher = TeacherNode(teacher_name="王大明", courses={})
+    cls = ClassNode(class_code="101", courses={})
+    node = build_course(teacher, cls, 1, 1)
+    same = CourseNode(time=node.time, teachers=node.teachers, classes=node.classes)
+    other = build_course(teacher, cls, 1, 2)
+
+    assert hash(node) == hash(node)
+    assert node == same and hash(node) == hash(same)
+    assert node != other
+    assert len({node, same, other}) == 2
+
+
+def test_course_node_hash_after_mutation():
+    """測試建構後調整班級，雜湊值依目前內容計算"""
+    teacher = TeacherNode(teacher_name="王大明", courses={})
+    cls = ClassNode(class_code="101", courses={})
+    other_cls = ClassNode(class_code="102", courses={})
+    node = build_course(teacher, cls, 1, 1)
+    hash(node)
+
+    node.classes.clear()
+    node.classes["102"] = other_cls
+    fresh = CourseNode(time=node.time, teachers={"王大明": teacher}, classes={"102": other_cls})
+
+    assert node == fresh
+    assert hash(node) == hash(fresh)
+
+
+def test_course_node_eq():
+    """測試課程節點以時間、狀態與教師/班級名稱判斷相等"""
+    teacher = TeacherNode(teacher_name="王大明", courses={})
+    cls = ClassNode(class_code="101", courses={})
+    node = build_course(teacher, cls, 1, 1)
+    # 另一個同名節點物件，視為相同
+    copy = CourseNode(
+        time=node.time,
+        teachers={"王大明": TeacherNode(teacher_name="王大明", courses={})},
+        classes={"101": ClassNode(class_code="101", courses={})},
+    )
+    free = CourseNode(time=node.time, is_free=True, teachers=node.teachers, classes=node.classes)
+
+    assert node == node
+    assert node == copy
+    assert node != free
+    assert node != "王大明"
+
+
+def test_nodes_are_slotted():
+    """測試節點不帶實例 __dict__，並以物件身分判斷相等"""
+    teacher = TeacherNode(teacher_name="王大明", courses={})
+    cls = ClassNode(class_code="101", courses={})
+    node = build_course(teacher, cls, 1, 1)
+
+    for obj in (teacher, cls, node):
+        assert not hasattr(obj, "__dict__")
+    assert teacher != TeacherNode(teacher_name="王大明", courses={})
+    assert len({teacher, cls}) == 2
+
+
+def test_course_node_short():
+    """測試課程節點的簡短表示"""
+    teacher = TeacherNode(teacher_name="王大明", courses={})
+    cls = ClassNode(class_code="101", courses={})
+    node = build_course(teacher, cls, 1, 2)
+
+    assert node.short() == "<T[王大明] 1-2(x1) busy C[101]>"
+
+    node.classes.clear()
+    node.classes["102"] = ClassNode(class_code="102", courses={})
+    node.is_free = True
+    assert node.short() == "<T[王大明] 1-2(x1) free C[102]>"
+
+
+@pytest.mark.asyncio
+async def test_build_course_node_from_log_dict(monkeypatch):
+    """測試由時段紀錄建立課程節點，師班互相對應的課程才會連結"""
+    teacher = TeacherNode(teacher_name="王大明", courses={})
+    cls = ClassNode(class_code="101", courses={})
+    monkeypatch.setattr(models, "_teacher_node_dict", models.TeacherNodeDict(root={"王大明": teacher}))
+    monkeypatch.setattr(models, "_class_node_dict", models.ClassNodeDict(root={"101": cls}))
+
+    def info(subject, participant):
+        return CourseInfo(subject=subject, counterpart=[CounterPart(participant=participant, url="")])
+
+    log_dict = TimetableSlotLogDict(root={
+        ("101", StreakTime(weekday=1, period=1, streak=1)): info("國文", "王大明"),
+        ("王大明", StreakTime(weekday=1, period=1, streak=1)): info("國文", "101"),
+        # 科目不一致，不建立節點
+        ("101", StreakTime(weekday=1, period=2, streak=1)): info("數學", "王大明"),
+        ("王大明", StreakTime(weekday=1, period=2, streak=1)): info("國文", "101"),
+        ("王大明", StreakTime(weekday=1, period=3, streak=1)): None,
+    })
+
+    await build_course_node_from_log_dict(log_dict)
+
+    busy = teacher.courses[StreakTime(weekday=1, period=1, streak=1)]
+    assert busy is cls.courses[busy.time]
+    assert not busy.is_free and busy.subject == "國文"
+    assert StreakTime(weekday=1, period=2, streak=1) not in teacher.courses
+    assert teacher.courses[StreakTime(weekday=1, period=3, streak=1)].is_free
+
+
+@pytest.mark.asyncio
+async def test_node_dict_cached(monkeypatch):
+    """測試節點字典快取命中時回傳同一個實例"""
+    cached = models.TeacherNodeDict(root={"王大明": TeacherNode(teacher_name="王大明", courses={})})
+    monkeypatch.setattr(models, "_teacher_node_dict", cached)
+    assert await models.TeacherNodeDict.fetch() is cached
+
+
+@pytest.mark.asyncio
+async def test_node_dict_uses_given_index(monkeypatch, index_result):
+    """測試傳入已取得的索引時直接以其建立節點"""
+    monkeypatch.setattr(models, "_teacher_node_dict", None)
+    monkeypatch.setattr(models, "_class_node_dict", None)
+    # 同一位教師出現在兩個分類時只建立一個節點
+    index_result.teacher.data["導師"] = {"王大明": "TA01.html"}
+    index = Index()
+    index.index = index_result
+
+    teacher_dict = await models.TeacherNodeDict.fetch(index=index)
+    class_dict = await models.ClassNodeDict.fetch(index=index)
+
+    assert list(teacher_dict.root) == ["王大明"]
+    assert list(class_dict.root) == ["101"]
+
+
+def test_streak_start_index_matches_scan():
+    """測試課程開始點索引與逐節往前搜尋的結果相同"""
+    from tnfsh_timetable_core.scheduling.scheduling import Scheduling
+
+    teacher = TeacherNode(teacher_name="王大明", courses={})
+    cls = ClassNode(class_code="101", courses={})
+    build_course(teacher, cls, 1, 2)
+    build_course(teacher, cls, 1, 5)
+    build_course(teacher, cls, 3, 8)
+
+    index = models.build_streak_start_index({"王大明": teacher})
+    scheduling = Scheduling()
+    for weekday in range(1, 6):
+        for period in range(1, models.MAX_PERIOD + 1):
+            time = StreakTime(weekday=weekday, period=period, streak=1)
+            expected = scheduling.find_streak_start(teacher, time)
+            assert index.get(("王大明", weekday, period)) is expected
+
+
+def test_course_node_primary():
+    """測試課程節點的第一位教師與班級，並反映建構後的調整"""
+    teacher = TeacherNode(teacher_name="王大明", courses={})
+    cls = ClassNode(class_code="101", courses={})
+    node = build_course(teacher, cls, 1, 1)
+
+    assert node.primary_teacher is teacher
+    assert node.primary_class is cls
+    node.classes.clear()
+    assert node.primary_class is None
+
+
+@pytest.mark.asyncio
+async def test_node_dicts_cached(monkeypatch):
+    """測試 NodeDicts 只建立一次，並行呼叫共用同一個實例，refresh 時重新建立"""
+    import asyncio
+
+    builds = []
+
+    async def fake_build(cls, log_dict, refresh):
+        builds.append(refresh)
+        await asyncio.sleep(0)
+        return cls()
+
+    monkeypatch.setattr(models, "_node_dicts", None)
+    monkeypatch.setattr(models.NodeDicts, "_build", classmethod(fake_build))
+
+    first, second = await asyncio.gather(models.NodeDicts.fetch(), models.NodeDicts.fetch())
+    assert first is second
+    assert builds == [False]
+
+    refreshed = await models.NodeDicts.fetch(refresh=True)
+    assert refreshed is not first
+    assert await models.NodeDicts.fetch() is refreshed
+    assert builds == [False, True]
+
+
+@pytest.mark.asyncio
+async def test_node_dicts_skip_index_when_cached(monkeypatch):
+    """測試教師與班級節點都已快取時，建立 NodeDicts 不會取得索引"""
+    from tnfsh_timetable_core import TNFSHTimetableCore
+
+    teacher = TeacherNode(teacher_name="王大明", courses={})
+    cls = ClassNode(class_code="101", courses={})
+    monkeypatch.setattr(models, "_teacher_node_dict", models.TeacherNodeDict(root={"王大明": teacher}))
+    monkeypatch.setattr(models, "_class_node_dict", models.ClassNodeDict(root={"101": cls}))
+
+    async def fail_fetch_index(self):
+        raise AssertionError("不應取得索引")
+
+    monkeypatch.setattr(TNFSHTimetableCore, "fetch_index", fail_fetch_index)
+
+    node_dicts = await models.NodeDicts._build(TimetableSlotLogDict(root={}), refresh=False)
+    assert node_dicts.teacher_nodes.root == {"王大明": teacher}
+    assert node_dicts.class_nodes.root == {"101": cls}
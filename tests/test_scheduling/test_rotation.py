@@ -481,8 +481,54 @@ async def test_yan_young_jing_2_4():
     else:
         print("沒有找到任何輪調路徑")
 
+
+def test_1_hop_cache(monkeypatch):
+    """測試單次搜尋的 get_1_hop 快取：結果相同，且同一組節點只計算一次"""
+    from tnfsh_timetable_core.scheduling import utils
+
+    teacher_a = TeacherNode(teacher_name="A", courses={})
+    teacher_b = TeacherNode(teacher_name="B", courses={})
+    cls = ClassNode(class_code="101", courses={})
+    a1 = build_course(teacher_a, cls, 1, 1, 1)
+    b2 = build_course(teacher_b, cls, 1, 2, 1)
+    build_course(teacher_a, cls, 1, 2, 1, is_free=True)
+
+    calls = []
+    original = utils.get_1_hop
+    monkeypatch.setattr(utils, "get_1_hop", lambda *args, **kwargs: calls.append(args) or original(*args, **kwargs))
+
+    cached_get_1_hop = utils.make_1_hop_cache()
+    expected = original(a1, b2, type="bwd")
+    assert cached_get_1_hop(a1, b2, type="bwd") is expected
+    assert cached_get_1_hop(a1, b2, type="bwd") is expected
+    assert len(calls) == 1
+    cached_get_1_hop(a1, b2, type="fwd")
+    assert len(calls) == 2
+    # 不同模式分開快取；freed 非空時不經快取
+    cached_get_1_hop(a1, b2, type="bwd", mode="swap")
+    assert len(calls) == 3
+    cached_get_1_hop(a1, b2, type="bwd", mode="swap", freed={a1})
+    cached_get_1_hop(a1, b2, type="bwd", mode="swap", freed={a1})
+    assert len(calls) == 5
+
+
+def test_neighbors_cache():
+    """測試單次搜尋的鄰居快取與 get_neighbors 結果相同，且重複呼叫回傳同一物件"""
+    from tnfsh_timetable_core.scheduling.utils import get_neighbors, make_neighbors_cache
+
+    teacher = TeacherNode(teacher_name="A", courses={})
+    cls = ClassNode(class_code="101", courses={})
+    a1 = build_course(teacher, cls, 1, 1, 1)
+    build_course(teacher, cls, 1, 2, 1)
+
+    cached_get_neighbors = make_neighbors_cache()
+    neighbors = cached_get_neighbors(a1)
+    assert list(neighbors) == get_neighbors(a1)
+    assert cached_get_neighbors(a1) is neighbors
+
+
 if __name__ == "__main__":
 
     # 測試顏永進老師的 3-2 課程配置
     import asyncio
-    asyncio.run(test_yan_young_jing_2_4())
\ No newline at end of file
+    asyncio.run(test_yan_young_jing_2_4())
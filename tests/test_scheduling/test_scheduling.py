@@ -0,0 +1,78 @@
+import pytest
+from tnfsh_timetable_core.scheduling.models import NodeDicts, TeacherNode, TeacherNodeDict, ClassNode, CourseNode
+from tnfsh_timetable_core.scheduling.scheduling import Scheduling
+from tnfsh_timetable_core.timetable_slot_log_dict.models import StreakTime
+
+
+def build_node_dicts() -> NodeDicts:
+    """建立不需連網的測試節點：王大明星期一第 2 節起連續兩節"""
+    teacher = TeacherNode(teacher_name="王大明", courses={})
+    cls = ClassNode(class_code="101", courses={})
+    time = StreakTime(weekday=1, period=2, streak=2)
+    node = CourseNode(time=time, teachers={"王大明": teacher}, classes={"101": cls})
+    teacher.courses[time] = node
+    cls.courses[time] = node
+    node_dicts = NodeDicts()
+    node_dicts.teacher_nodes = TeacherNodeDict(root={"王大明": teacher})
+    return node_dicts
+
+
+@pytest.mark.asyncio
+async def test_fetch_course_node_cached(monkeypatch):
+    """測試同一課程節點只解析一次，refresh 時重新解析"""
+    node_dicts = build_node_dicts()
+    searches = []
+    find_streak_start = Scheduling.find_streak_start
+
+    async def fake_fetch(cls, log_dict=None, refresh=False):
+        return node_dicts
+
+    def counting_find(self, node, streak_time):
+        searches.append(streak_time)
+        return find_streak_start(self, node, streak_time)
+
+    monkeypatch.setattr(NodeDicts, "fetch", classmethod(fake_fetch))
+    monkeypatch.setattr(Scheduling, "find_streak_start", counting_find)
+    scheduling = Scheduling()
+
+    node = await scheduling.fetch_course_node("王大明", 1, 3, ignore_condition=True)
+    assert node.time == StreakTime(weekday=1, period=2, streak=2)
+    assert await scheduling.fetch_course_node("王大明", 1, 3, ignore_condition=True) is node
+    assert len(searches) == 1
+
+    await scheduling.fetch_course_node("王大明", 1, 3, refresh=True, ignore_condition=True)
+    assert len(searches) == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_course_node_cache_follows_rebuild(monkeypatch):
+    """測試節點圖重建後不會回傳舊圖的課程節點"""
+    graphs = [build_node_dicts(), build_node_dicts()]
+    current = graphs[0]
+
+    async def fake_fetch(cls, log_dict=None, refresh=False):
+        return current
+
+    monkeypatch.setattr(NodeDicts, "fetch", classmethod(fake_fetch))
+    scheduling = Scheduling()
+
+    old_node = await scheduling.fetch_course_node("王大明", 1, 2, ignore_condition=True)
+    current = graphs[1]
+    new_node = await scheduling.fetch_course_node("王大明", 1, 2, ignore_condition=True)
+    assert new_node is not old_node
+    assert new_node is graphs[1].teacher_nodes.root["王大明"].courses[old_node.time]
+
+
+@pytest.mark.asyncio
+async def test_fetch_course_node_missing(monkeypatch):
+    """測試找不到課程節點時拋出 ValueError，且不寫入快取"""
+    node_dicts = build_node_dicts()
+
+    async def fake_fetch(cls, log_dict=None, refresh=False):
+        return node_dicts
+
+    monkeypatch.setattr(NodeDicts, "fetch", classmethod(fake_fetch))
+
+    with pytest.raises(ValueError, match="課程節點不存在"):
+        await Scheduling().fetch_course_node("王大明", 2, 1, ignore_condition=True)
+    assert node_dicts.course_node_cache == {}
@@ -1,5 +1,7 @@
 import pytest
 import asyncio
+import copy
+import pickle
 from tnfsh_timetable_core.timetable.cache import preload_all
 from tnfsh_timetable_core.utils.logger import get_logger
 
@@ -13,5 +15,189 @@ async def test_preload_all():
     assert True
 
 
+
+@pytest.mark.asyncio
+async def test_preload_all_concurrency(monkeypatch):
+    """測試預載入的同時請求數不超過併發上限，且每個目標都會處理"""
+    from tnfsh_timetable_core.index.index import Index
+    from tnfsh_timetable_core.timetable import cache
+
+    targets = [f"1{i:02d}" for i in range(10)]
+
+    async def fake_index_fetch(self, *args, **kwargs):
+        self.reverse_index = {target: None for target in targets}
+
+    active = 0
+    peak = 0
+    fetched = []
+
+    async def fake_fetch_cached(target, *args, **kwargs):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        fetched.append(target)
+        active -= 1
+
+    monkeypatch.setattr(Index, "fetch", fake_index_fetch)
+    monkeypatch.setattr(cache.TimeTable, "fetch_cached", fake_fetch_cached)
+
+    await preload_all(only_missing=False, max_concurrent=3)
+
+    assert sorted(fetched) == targets
+    assert peak == 3
+
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_roundtrip(monkeypatch, tmp_path):
+    """測試非同步讀寫磁碟快取後內容不變"""
+    from tnfsh_timetable_core.timetable import cache
+
+    table = cache.load_table_from_disk("101")
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path)
+
+    assert await cache.aload_table_from_disk("101") is None
+    assert await cache.asave_to_disk("101", table)
+    assert await cache.aload_table_from_disk("101") == table
+    assert await cache.aload_table_from_disk("102") is None
+
+
+
+@pytest.mark.asyncio
+async def test_preload_all_skips_cached(monkeypatch, tmp_path):
+    """測試只載入缺少的課表時，依快取目錄中的非空檔案略過目標"""
+    from tnfsh_timetable_core.index.index import Index
+    from tnfsh_timetable_core.timetable import cache
+
+    (tmp_path / "prebuilt_101.json").write_text("{}", encoding="utf-8")
+    (tmp_path / "prebuilt_102.json").write_text("", encoding="utf-8")
+    (tmp_path / "other.json").write_text("{}", encoding="utf-8")
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path)
+    assert cache.list_cached_targets() == {"101"}
+
+    async def fake_index_fetch(self, *args, **kwargs):
+        self.reverse_index = {"101": None, "102": None, "103": None}
+
+    fetched = []
+
+    async def fake_fetch_cached(target, *args, **kwargs):
+        fetched.append(target)
+
+    monkeypatch.setattr(Index, "fetch", fake_index_fetch)
+    monkeypatch.setattr(cache.TimeTable, "fetch_cached", fake_fetch_cached)
+
+    await preload_all(only_missing=True)
+
+    assert sorted(fetched) == ["102", "103"]
+
+
+
+def test_prebuilt_cache_lru():
+    """測試記憶體快取超過上限時淘汰最久未使用的課表"""
+    from tnfsh_timetable_core.timetable.cache import _LRUDict
+
+    cache = _LRUDict(maxsize=2)
+    cache["101"] = "a"
+    cache["102"] = "b"
+    assert cache["101"] == "a"  # 讀取後 101 變為最近使用
+    cache["103"] = "c"
+
+    assert "102" not in cache
+    assert list(cache) == ["101", "103"]
+
+
+@pytest.mark.parametrize("clone", [lambda d: d.copy(), copy.copy, lambda d: pickle.loads(pickle.dumps(d))])
+def test_prebuilt_cache_clone(clone):
+    """測試記憶體快取複製與序列化後保留內容、順序與容量上限"""
+    from tnfsh_timetable_core.timetable.cache import _LRUDict, PREBUILT_CACHE_MAXSIZE
+
+    assert _LRUDict().maxsize == PREBUILT_CACHE_MAXSIZE
+
+    cache = _LRUDict(maxsize=2)
+    cache["101"] = "a"
+    cache["102"] = "b"
+    cloned = clone(cache)
+
+    assert type(cloned) is _LRUDict
+    assert cloned.maxsize == 2
+    assert list(cloned.items()) == [("101", "a"), ("102", "b")]
+    cloned["103"] = "c"
+    assert list(cloned) == ["102", "103"]
+    assert list(cache) == ["101", "102"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_cached_coalesces_requests(monkeypatch):
+    """測試同一目標同時抓取時只發出一次網路請求，失敗時所有等待者都收到例外"""
+    from tnfsh_timetable_core.timetable import cache
+    from tnfsh_timetable_core.timetable.models import TimeTable
+
+    table = cache.load_table_from_disk("101")
+    requests = []
+    fail = False
+
+    async def fake_request(cls, target):
+        requests.append(target)
+        await asyncio.sleep(0.01)
+        if fail:
+            raise RuntimeError("network down")
+        return table
+
+    async def fake_save(target, table):
+        return True
+
+    monkeypatch.setattr(TimeTable, "_request", classmethod(fake_request))
+    monkeypatch.setattr(cache, "asave_to_disk", fake_save)
+    monkeypatch.setattr(cache, "prebuilt_cache", cache._LRUDict())
+
+    results = await asyncio.gather(*(TimeTable.fetch_cached("101", refresh=True) for _ in range(3)))
+    assert all(result is table for result in results)
+    assert requests == ["101"]
+    assert cache._inflight == {}
+
+    fail = True
+    results = await asyncio.gather(
+        *(TimeTable.fetch_cached("101", refresh=True) for _ in range(2)),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert requests == ["101", "101"]
+    assert cache._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_fetch_cached_leader_cancelled(monkeypatch):
+    """測試負責抓取的請求被取消時，等待者不被連帶取消，而是重新抓取"""
+    from tnfsh_timetable_core.timetable import cache
+    from tnfsh_timetable_core.timetable.models import TimeTable
+
+    table = cache.load_table_from_disk("101")
+    requests = []
+
+    async def fake_request(cls, target):
+        requests.append(target)
+        await asyncio.sleep(0.01)
+        return table
+
+    async def fake_save(target, table):
+        return True
+
+    monkeypatch.setattr(TimeTable, "_request", classmethod(fake_request))
+    monkeypatch.setattr(cache, "asave_to_disk", fake_save)
+    monkeypatch.setattr(cache, "prebuilt_cache", cache._LRUDict())
+
+    leader = asyncio.create_task(TimeTable.fetch_cached("101", refresh=True))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(TimeTable.fetch_cached("101", refresh=True))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await waiter is table
+    assert leader.cancelled()
+    assert requests == ["101", "101"]
+    assert cache._inflight == {}
+
+
 if __name__ == "__main__":
     asyncio.run(test_preload_all())
\ No newline at end of file
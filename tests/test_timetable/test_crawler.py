@@ -2,7 +2,7 @@ import pytest
 import asyncio
 import json
 from bs4 import BeautifulSoup
-from tnfsh_timetable_core.timetable.crawler import fetch_raw_html, parse_html
+from tnfsh_timetable_core.timetable.crawler import fetch_raw_html, parse_html, format_period_time
 from tnfsh_timetable_core.utils.logger import get_logger
 
 # 設定日誌
@@ -36,6 +36,13 @@ async def test_fetch_and_parse_timetable(tmp_path):
     assert len(parsed_result["table"]) > 0
 
 
+def test_format_period_time():
+    """測試節次時間格式化"""
+    assert format_period_time("0810") == "08:10"
+    assert format_period_time("1610") == "16:10"
+    assert format_period_time("08:10") == "08:10"
+    assert format_period_time("") == ""
+
 
 if __name__ == "__main__":
     asyncio.run(test_fetch_and_parse_timetable())
\ No newline at end of file
@@ -92,6 +92,13 @@ class TestCache:
         expected = cache._convert_to_dict(logs)
         assert result.root == expected.root
 
+    @pytest.mark.asyncio
+    async def test_file_cache_invalid(self, cache_with_temp_dir):
+        """測試檔案快取內容無效時視為沒有快取"""
+        cache = cache_with_temp_dir
+        cache._cache_file.write_text("{not json", encoding="utf-8")
+        assert await cache.fetch_from_file() is None
+
     @pytest.mark.asyncio
     async def test_fetch_fallback(self, cache_with_temp_dir, sample_dict, sample_logs):
         """測試快取的 fallback 機制"""
@@ -0,0 +1,20 @@
+from tnfsh_timetable_core.timetable_slot_log_dict.models import StreakTime, TimetableSlotLog
+
+
+def test_streak_time_key():
+    """測試 StreakTime 只以星期與節次判斷相等，可作為字典鍵"""
+    short = StreakTime(weekday=1, period=2, streak=1)
+    long = StreakTime(weekday=1, period=2, streak=3)
+
+    assert short == long and hash(short) == hash(long)
+    assert {long: "國文"}[short] == "國文"
+    assert short < StreakTime(weekday=1, period=3, streak=1)
+    assert sorted([StreakTime(weekday=2, period=1, streak=1), short])[0] is short
+
+
+def test_streak_time_roundtrip():
+    """測試 StreakTime 作為 TimetableSlotLog 欄位可序列化並讀回"""
+    log = TimetableSlotLog(source="101", streak_time=StreakTime(weekday=1, period=2, streak=3), log=None)
+    loaded = TimetableSlotLog(**log.model_dump())
+    assert loaded.streak_time.streak == 3
+    assert loaded == log
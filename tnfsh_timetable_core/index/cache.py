@@ -1,10 +1,8 @@
 from typing import Optional
 from pathlib import Path
-import json
 import asyncio
 from datetime import datetime
 from tnfsh_timetable_core.index.models import IndexResult, AllTypeIndexResult
-from tnfsh_timetable_core.index.crawler import request_all_index, merge_results, re
 from tnfsh_timetable_core.utils.logger import get_logger
 
 logger = get_logger(logger_level="INFO")
@@ -35,13 +33,12 @@ async def load_from_disk() -> Optional[AllTypeIndexResult]:
     path = CACHE_DIR / "all_type_index.json"
     try:
         if path.exists() and path.stat().st_size > 0:
-            with open(path, encoding="utf-8") as f:
-                data = json.load(f)
-                result = AllTypeIndexResult.model_validate(data)
-                # 更新記憶體快取
-                await save_to_memory(result)
-                logger.debug("💾 從檔案載入索引快取")
-                return result
+            # 由 pydantic-core 直接解析 JSON 位元組，不先建立中介的 Python dict
+            result = AllTypeIndexResult.model_validate_json(path.read_bytes())
+            # 更新記憶體快取
+            await save_to_memory(result)
+            logger.debug("💾 從檔案載入索引快取")
+            return result
     except Exception as e:
         logger.error(f"讀取快取檔案時發生錯誤: {e}")
     return None
@@ -2,13 +2,20 @@ from typing import Optional, TypeAlias, Dict, Union
 import aiohttp
 from aiohttp import client_exceptions
 import asyncio
+from itertools import chain
 from bs4 import BeautifulSoup
 import re
 from tnfsh_timetable_core.index.models import IndexResult, ReverseIndexResult, GroupIndex, ReverseMap, AllTypeIndexResult
 
-from tnfsh_timetable_core import TNFSHTimetableCore
-core = TNFSHTimetableCore()
-logger = core.get_logger()
+from tnfsh_timetable_core.utils.logger import get_logger
+
+logger = get_logger(logger_level="DEBUG")
+
+# 連結文字中的中文姓名
+_CHINESE_NAME_PATTERN = re.compile(r'([\u4e00-\u9fa5]+)')
+
+# 移除換行與空白用的轉換表
+_REMOVE_WHITESPACE = str.maketrans("", "", "\r\n ")
 
 class FetchError(Exception):
     """爬取課表時可能發生的錯誤"""
@@ -63,36 +70,36 @@ async def request_html(base_url: str, url: str, timeout: int = 15, from_file_pat
 
         except client_exceptions.ClientResponseError as e:
             error_msg = f"HTTP 狀態碼錯誤 {e.status}: {e.message}"
-            logger.warning(f"⚠️ {error_msg}")
+            logger.warning("⚠️ %s", error_msg)
             if attempt + 1 < max_retries:
-                logger.info(f"🔄 等待 {retry_delay} 秒後重試...")
+                logger.info("🔄 等待 %s 秒後重試...", retry_delay)
                 await asyncio.sleep(retry_delay)
                 continue
             raise aiohttp.ClientError(error_msg)
 
         except client_exceptions.ClientConnectorError as e:
             error_msg = f"連線錯誤：{str(e)}"
-            logger.warning(f"⚠️ {error_msg}")
+            logger.warning("⚠️ %s", error_msg)
             if attempt + 1 < max_retries:
-                logger.info(f"🔄 等待 {retry_delay} 秒後重試...")
+                logger.info("🔄 等待 %s 秒後重試...", retry_delay)
                 await asyncio.sleep(retry_delay)
                 continue
             raise aiohttp.ClientError(error_msg)
 
         except (client_exceptions.ServerTimeoutError, asyncio.TimeoutError):
             error_msg = "請求超時"
-            logger.warning(f"⚠️ {error_msg}")
+            logger.warning("⚠️ %s", error_msg)
             if attempt + 1 < max_retries:
-                logger.info(f"🔄 等待 {retry_delay} 秒後重試...")
+                logger.info("🔄 等待 %s 秒後重試...", retry_delay)
                 await asyncio.sleep(retry_delay)
                 continue
             raise aiohttp.ClientError(error_msg)
 
         except client_exceptions.ClientError as e:
             error_msg = f"網路請求錯誤：{str(e)}"
-            logger.warning(f"⚠️ {error_msg}")
+            logger.warning("⚠️ %s", error_msg)
             if attempt + 1 < max_retries:
-                logger.info(f"🔄 等待 {retry_delay} 秒後重試...")
+                logger.info("🔄 等待 %s 秒後重試...", retry_delay)
                 await asyncio.sleep(retry_delay)
                 continue
             raise aiohttp.ClientError(error_msg)
@@ -126,12 +133,12 @@ def parse_html(soup: BeautifulSoup, url: str) -> GroupIndex:
             if text.isdigit() and link:
                 parsed_data[current_category][text] = link
             else:
-                match = re.search(r'([\u4e00-\u9fa5]+)', text)
+                match = _CHINESE_NAME_PATTERN.search(text)
                 if match:
                     text = match.group(1)
                     parsed_data[current_category][text] = link
                 else:
-                    text = text.replace("\r", "").replace("\n", "").replace(" ", "").strip()
+                    text = text.translate(_REMOVE_WHITESPACE).strip()
                     if len(text) > 3:
                         text = text[3:].strip()
                         parsed_data[current_category][text] = link
@@ -151,19 +158,18 @@ def reverse_index(index: IndexResult) -> ReverseIndexResult:
     Returns:
         ReverseIndexResult: 反查表格式的資料
     """
-    result: ReverseIndexResult = {}
-    
-    # 處理老師資料
-    for category, teachers in index.teacher.data.items():
-        for teacher_name, url in teachers.items():
-            result[teacher_name] = ReverseMap(url=url, category=category)
-    
-    # 處理班級資料
-    for category, classes in index.class_.data.items():
-        for class_name, url in classes.items():
-            result[class_name] = ReverseMap(url=url, category=category)
+    # 老師與班級資料串接為單一走訪（班級在後，同名時沿用原本由班級覆蓋的行為）
+    groups = chain(index.teacher.data.items(), index.class_.data.items())
+    construct = ReverseMap.model_construct
+
+    # 資料皆由已驗證的 IndexResult 產生，略過重新驗證
+    result: Dict[str, ReverseMap] = {
+        name: construct(url=url, category=category)
+        for category, items in groups
+        for name, url in items.items()
+    }
     
-    return result
+    return ReverseIndexResult.model_construct(result)
 
 async def request_all_index(base_url: str) -> IndexResult:
     """非同步獲取完整的課表索引
@@ -203,7 +209,8 @@ def merge_results(index: IndexResult, reverse_index: ReverseIndexResult) -> AllT
     Returns:
         AllTypeIndexResult: 合併後的結果
     """
-    return AllTypeIndexResult(
+    # 兩者皆為已驗證的模型，以 model_construct 略過重複驗證
+    return AllTypeIndexResult.model_construct(
         index=index,
         reverse_index=reverse_index
     )
@@ -1,19 +1,24 @@
 from datetime import datetime
 from typing import Dict, Optional
 from tnfsh_timetable_core.index.models import IndexResult, ReverseIndexResult, AllTypeIndexResult
-from tnfsh_timetable_core.index.crawler import request_all_index
-from tnfsh_timetable_core.index.cache import fetch_with_cache
-import json
+from pydantic_core import to_json
+
+# export_json 支援的匯出類型
+_VALID_EXPORT_TYPES = frozenset(("index", "reverse_index", "all"))
 
 class Index:
     """台南一中課表索引的單例類別"""
     
+    # 以 __slots__ 取代實例 __dict__，減少記憶體並加快屬性存取
+    __slots__ = ("index", "reverse_index")
+
     base_url = "http://w3.tnfsh.tn.edu.tw/deanofstudies/course/"
-    index: Optional[IndexResult] = None
-    reverse_index: Optional[ReverseIndexResult] = None
+    index: Optional[IndexResult]
+    reverse_index: Optional[ReverseIndexResult]
 
     def __init__(self) -> None:
-        pass
+        self.index = None
+        self.reverse_index = None
 
     async def fetch(self, refresh: bool = False) -> None:
         """初始化索引資料
@@ -21,6 +26,8 @@ class Index:
         Args:
             refresh (bool): 是否強制重新從網路獲取資料
         """
+        # 延遲載入快取與爬蟲模組，只使用資料模型時不需付出匯入成本
+        from tnfsh_timetable_core.index.cache import fetch_with_cache
         result: AllTypeIndexResult = await fetch_with_cache(self.base_url, refresh=refresh)
         if self.index is None or refresh:
             self.index = result.index
@@ -29,12 +36,13 @@ class Index:
         #print(self.index.model_dump_json(indent=4))
         #print(json.dumps(self.reverse_index.model_dump(), indent=4, ensure_ascii=False))
 
-    def export_json(self, export_type: str = "all", filepath: Optional[str] = None) -> str:
+    def export_json(self, export_type: str = "all", filepath: Optional[str] = None, indent: bool = False) -> str:
         """匯出索引資料為 JSON 格式
         
         Args:
             export_type (str): 要匯出的資料類型 ("index"/"reverse_index"/"all"，預設為 "all")
             filepath (str, optional): 輸出檔案路徑，若未指定則自動生成
+            indent (bool): 是否以縮排格式輸出（預設為精簡格式，序列化較快、檔案較小）
             
         Returns:
             str: 實際儲存的檔案路徑
@@ -43,22 +51,18 @@ class Index:
             ValueError: 當 export_type 不合法時
             Exception: 當檔案寫入失敗時
         """
-        # 驗證 export_type
-        valid_types = ["index", "reverse_index", "all"]
+        # 驗證 export_type（只轉換一次小寫）
+        export_type = export_type.lower()
+        if export_type not in _VALID_EXPORT_TYPES:
+            raise ValueError("不支援的匯出類型。請使用 index, reverse_index, all")
 
-        if export_type.lower() not in valid_types:
-            raise ValueError(f"不支援的匯出類型。請使用 {', '.join(valid_types)}")
-        
-        if export_type == "all":
-            export_type = "index_all"
-            
         # 準備要匯出的資料
-        export_data = {}
-        if export_type.lower() == "index":
-            export_data["index"] = self.index.model_dump()
-        elif export_type.lower() == "reverse_index":
-            export_data["reverse_index"] = self.reverse_index
+        if export_type == "index":
+            export_data = {"index": self.index}
+        elif export_type == "reverse_index":
+            export_data = {"reverse_index": self.reverse_index}
         else:  # all
+            export_type = "index_all"
             export_data = {
                 "index": self.index,
                 "reverse_index": self.reverse_index
@@ -73,8 +77,9 @@ class Index:
 
         # 寫入 JSON 檔案
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, ensure_ascii=False, indent=2)
+            # 由 pydantic-core 直接序列化為 UTF-8 位元組，一次寫入
+            with open(filepath, 'wb') as f:
+                f.write(to_json(export_data, indent=2 if indent else None))
             return filepath
         except Exception as e:
             raise Exception(f"Failed to write JSON file: {str(e)}")
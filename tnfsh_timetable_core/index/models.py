@@ -1,5 +1,6 @@
-from typing import Optional, TypeAlias, Dict, Union
-from pydantic import BaseModel, RootModel
+import sys
+from typing import TypeAlias, Dict
+from pydantic import BaseModel, RootModel, field_validator
 from tnfsh_timetable_core.utils.dict_like import dict_like
 
 
@@ -53,12 +54,18 @@ class ReverseMap(BaseModel):
     url: URL
     category: CategoryName
 
-    def __getitem__(self, key: str) -> URL:
+    @field_validator("category")
+    @classmethod
+    def _intern_category(cls, value: str) -> str:
+        # 同一分類會重複出現在數百筆資料中，駐留後共用同一字串物件
+        return sys.intern(value)
 
-        if key == "url":
-            return self.url
-        elif key == "category":
-            return self.category
+    def __getitem__(self, key: str) -> URL:
+        # 欄位值即存放於實例 __dict__，直接查表；未知欄位拋出 KeyError
+        try:
+            return self.__dict__[key]
+        except KeyError:
+            raise KeyError(key) from None
 
 @dict_like
 class ReverseIndexResult(RootModel[Dict[str, ReverseMap]]): 
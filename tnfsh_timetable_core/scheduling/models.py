@@ -1,27 +1,28 @@
 from __future__ import annotations
-import logging
-from math import log
-import re
-from typing import Counter, Dict, TYPE_CHECKING
-from pydantic import BaseModel, RootModel
-from requests import get
+import asyncio
+import sys
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple, TYPE_CHECKING
+from pydantic import RootModel
+from pydantic_core import to_json
 from tnfsh_timetable_core.timetable.models import CourseInfo
 from tnfsh_timetable_core.timetable_slot_log_dict.models import StreakTime
-from tnfsh_timetable_core.utils.dict_like import dict_like
-
-from tnfsh_timetable_core.scheduling.utils import is_free
-
-import tnfsh_timetable_core
 
 from tnfsh_timetable_core.utils.logger import get_logger
 logger = get_logger(logger_level="DEBUG")
 
-# Global variables for caching
-teacher_node_cache = {}
-class_node_cache = {}
+# Global variables for caching：快取建好的 TeacherNodeDict / ClassNodeDict 實例本身
+_teacher_node_dict: Optional["TeacherNodeDict"] = None
+_class_node_dict: Optional["ClassNodeDict"] = None
+# 建好的 NodeDicts；首次建立時以鎖避免並行呼叫重複建立
+_node_dicts: Optional["NodeDicts"] = None
+# asyncio.Lock 會綁定事件迴圈，依目前執行中的迴圈各自建立
+_node_dicts_locks: Dict[asyncio.AbstractEventLoop, asyncio.Lock] = {}
 
 # === Forward reference：宣告在前、定義在後 ===
-class CourseNode(BaseModel):
+# 節點由已驗證的課表資料建立，不需 pydantic 驗證，改用 slots dataclass 加快建構與屬性存取
+@dataclass(slots=True, eq=False, kw_only=True)
+class CourseNode:
     time: StreakTime
     is_free: bool = False
     subject: str = ""
@@ -29,65 +30,72 @@ class CourseNode(BaseModel):
     classes: Dict[str, "ClassNode"]
 
     def __hash__(self) -> int:
+        # 建構後仍可能調整 teachers/classes，每次依目前內容計算，不快取
         teacher_keys = tuple(sorted(self.teachers.keys()))
         class_keys = tuple(sorted(self.classes.keys()))
         return hash((self.time, teacher_keys, class_keys))
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, CourseNode):
             return NotImplemented
+        # 同一次建構中節點以名稱唯一識別，比較鍵值即可，不需遞迴比較節點內容
         return (self.time == other.time and
                 self.is_free == other.is_free and
-                self.teachers == other.teachers and
-                self.classes == other.classes
+                self.teachers.keys() == other.teachers.keys() and
+                self.classes.keys() == other.classes.keys()
                 )
     
+    @property
+    def primary_teacher(self) -> Optional["TeacherNode"]:
+        """第一位教師，不建立暫存串列；建構後仍可能調整 teachers，故不快取"""
+        return next(iter(self.teachers.values()), None)
+
+    @property
+    def primary_class(self) -> Optional["ClassNode"]:
+        """第一個班級，不建立暫存串列"""
+        return next(iter(self.classes.values()), None)
+
     def __lt__(self, other: "CourseNode") -> bool:
         if not isinstance(other, CourseNode):
             return NotImplemented
         return (self.time) < (other.time)
 
     def short(self) -> str:
+        # 建構後仍可能調整 teachers/classes 與 is_free，每次依目前內容產生，不快取
         teacher_keys = ",".join(sorted(self.teachers))
         class_keys = ",".join(sorted(self.classes))
         t = self.time
-        result = f"<T[{teacher_keys}] {t.weekday}-{t.period}(x{t.streak}) {'free' if self.is_free else 'busy'} C[{class_keys}]>"
-        #result = f"{teacher_keys}[{t.period}]"
-        return result
+        return f"<T[{teacher_keys}] {t.weekday}-{t.period}(x{t.streak}) {'free' if self.is_free else 'busy'} C[{class_keys}]>"
 
-class TeacherNode(BaseModel):
+@dataclass(slots=True, eq=False, kw_only=True)
+class TeacherNode:
     teacher_name: str
     courses: Dict[StreakTime, "CourseNode"]
 
     def short(self) -> str:
         """返回教師節點的簡短表示"""
-        course_keys = ",".join([key.model_dump_json(indent=4) for key in sorted(self.courses.keys())])
+        course_keys = ",".join([to_json(key, indent=4).decode() for key in sorted(self.courses.keys())])
         return f"<T[{self.teacher_name}] {course_keys}>"
 
 
-class ClassNode(BaseModel):
+@dataclass(slots=True, eq=False, kw_only=True)
+class ClassNode:
     class_code: str
     courses: Dict[StreakTime, "CourseNode"]
 
     def short(self) -> str:
         """返回班級節點的簡短表示"""
-        course_keys = ",".join([key.model_dump_json(indent=4) for key in sorted(self.courses.keys())])
+        course_keys = ",".join([to_json(key, indent=4).decode() for key in sorted(self.courses.keys())])
         return f"<C[{self.class_code}] {course_keys}>"
 
 
 
 
-# ✅ 重建 forward reference（Pydantic 解析字串型別）
-CourseNode.model_rebuild()
-TeacherNode.model_rebuild()
-ClassNode.model_rebuild()
-
-
 from tnfsh_timetable_core.abc.domain_abc import BaseDomainABC
-from tnfsh_timetable_core.utils.dict_like import dict_like
 
 if TYPE_CHECKING:
-    from tnfsh_timetable_core.timetable.models import TimeTable
     from tnfsh_timetable_core.index.index import Index
 
 #@dict_like
@@ -96,33 +104,32 @@ class TeacherNodeDict(RootModel[
 ], BaseDomainABC):
 
     @classmethod
-    async def fetch(cls, *args, refresh: bool = False, **kwargs) -> TeacherNodeDict:
+    async def fetch(cls, *args, refresh: bool = False, index: Optional[Index] = None, **kwargs) -> TeacherNodeDict:
         """三層快取的統一入口，回傳 domain 實例
         此時 TeacherNode 尚未新增course
+
+        Args:
+            index: 已取得的索引，未提供時自行取得
         """
-        global teacher_node_cache
-        if refresh:
-            # 強制更新
-            teacher_node_cache = {}
-        if teacher_node_cache:
-            # 如果快取中有資料，回傳新的實例
-            return cls(root=teacher_node_cache)
+        global _teacher_node_dict
+        if _teacher_node_dict is not None and not refresh:
+            # 快取命中，直接回傳同一個實例
+            return _teacher_node_dict
         
-        from tnfsh_timetable_core import TNFSHTimetableCore
-        core = TNFSHTimetableCore()
-        index:Index = await core.fetch_index()
+        if index is None:
+            from tnfsh_timetable_core import TNFSHTimetableCore
+            core = TNFSHTimetableCore()
+            index = await core.fetch_index()
         categories = index.index.teacher.data
-        result: Dict[str, TeacherNode] = {}
-        for category, items in categories.items():
-            for teacher_name, url in items.items():
-                if teacher_name not in result:
-                    result[teacher_name] = TeacherNode(teacher_name=teacher_name, courses={})
-        teacher_node_cache = result
-        if result is None:
-            print(f"Warning: {result} is None, this may be a problem.")
-            raise ValueError("TeacherNodeDict fetch failed, result is None.")
-        # print(result)
-        return cls(root=result)
+        # 同名教師只會保留一個節點（此時節點皆為空，保留哪一個並無差別）
+        result: Dict[str, TeacherNode] = {
+            teacher_name: TeacherNode(teacher_name=teacher_name, courses={})
+            for items in categories.values()
+            for teacher_name in items
+        }
+        # 節點皆為剛建立的物件，略過 RootModel 驗證
+        _teacher_node_dict = cls.model_construct(result)
+        return _teacher_node_dict
 
 #@dict_like
 class ClassNodeDict(RootModel[
@@ -130,141 +137,163 @@ class ClassNodeDict(RootModel[
 ], BaseDomainABC):
 
     @classmethod
-    async def fetch(cls, *args, refresh: bool = False, **kwargs) -> ClassNodeDict:
+    async def fetch(cls, *args, refresh: bool = False, index: Optional[Index] = None, **kwargs) -> ClassNodeDict:
         """三層快取的統一入口，回傳 domain 實例
+
+        Args:
+            index: 已取得的索引，未提供時自行取得
         """
-        global class_node_cache
-        if refresh:
-            # 強制更新
-            class_node_cache = {}
-        if class_node_cache:
-            # 如果快取中有資料，回傳新的實例
-            return cls(root=class_node_cache)
+        global _class_node_dict
+        if _class_node_dict is not None and not refresh:
+            # 快取命中，直接回傳同一個實例
+            return _class_node_dict
         
-        from tnfsh_timetable_core import TNFSHTimetableCore
-        core = TNFSHTimetableCore()
-        index:Index = await core.fetch_index()
+        if index is None:
+            from tnfsh_timetable_core import TNFSHTimetableCore
+            core = TNFSHTimetableCore()
+            index = await core.fetch_index()
         categories = index.index.class_.data
-        result: Dict[str, ClassNode] = {}
-        for category, items in categories.items():
-            for class_code, url in items.items():
-                if class_code not in result:
-                    result[class_code] = ClassNode(class_code=class_code, courses={})
-        class_node_cache = result
-        return cls(root=result)
+        result: Dict[str, ClassNode] = {
+            class_code: ClassNode(class_code=class_code, courses={})
+            for items in categories.values()
+            for class_code in items
+        }
+        _class_node_dict = cls.model_construct(result)
+        return _class_node_dict
         
 
 from tnfsh_timetable_core.timetable_slot_log_dict.timetable_slot_log_dict import TimetableSlotLogDict
 async def build_course_node_from_log_dict(log_dict:TimetableSlotLogDict):
     """從課表時段紀錄字典建立課程節點"""
     from tnfsh_timetable_core.scheduling.models import CourseNode
-    final_course_nodes_set = set()
     class_dict = await ClassNodeDict.fetch()
     teacher_dict = await TeacherNodeDict.fetch()
     class_nodes = class_dict.root
     teacher_nodes = teacher_dict.root
 
-    for (source, streak_time), course_info in log_dict.items():
-        from tnfsh_timetable_core.timetable.models import CourseInfo
-        course_info: CourseInfo = course_info
+    # 一次走訪將紀錄分為班級與教師兩部分，之後的迴圈不需再逐筆判斷 isdigit
+    # 教師紀錄以純 tuple 為鍵，反查時不需呼叫 StreakTime.__hash__/__eq__
+    class_rows = []
+    teacher_logs: Dict[tuple, CourseInfo] = {}
+    free_teacher_slots = []
+    for (source, streak_time), info in log_dict.root.items():
         if source.isdigit():
-            # 這是班級課程
-            class_code = source
-            if course_info is None:
-                # 空堂
-                course_node = CourseNode(
-                    time=streak_time,
-                    is_free=True,
-                    subject="",
-                    teachers={},
-                    classes={class_code: class_nodes[class_code]}
-                )
-                #print()
-                #logger.debug(f"Adding free class course node: {course_node.short()}")
-                final_course_nodes_set.add(course_node)
-                continue
-                
-            # 處理有課程資訊的情況
-            counter_parts = course_info.counterpart
-            if not counter_parts:
-                # 這節有課但沒老師
-                continue
-            if len(counter_parts) != 1:
-                # 多老師或多班級或無班級或無老師
-                continue
-            teacher_name = counter_parts[0].participant
-            counter_log: CourseInfo = log_dict.get((teacher_name, streak_time))
-            counter_counterpart = counter_log.counterpart if counter_log else None
-            if counter_log is None:
-                # 沒有對應的老師課程
-                continue
-            if counter_counterpart is None:
-                # 對應的老師沒有紀錄課程
-                #print(f"{counter_log} has no counterpart for {streak_time}")
-                #print(f"Warning: {teacher_name} has no counterpart in log_dict for {streak_time}")
-                continue
-            if len(counter_counterpart) != 1:
-                # 多老師或多班級或無班級或無老師
-                continue
-            if counter_log.counterpart[0].participant != class_code:
-                # 班級不對
-                continue
-            if counter_log.subject != course_info.subject:
-                # 科目不對
-                continue
-            
+            class_rows.append((sys.intern(source), streak_time, info))
+        else:
+            teacher_logs[(source, streak_time.weekday, streak_time.period)] = info
+            if info is None:
+                free_teacher_slots.append((sys.intern(source), streak_time))
+
+    # 班級課程
+    for class_code, streak_time, course_info in class_rows:
+        course_info: CourseInfo = course_info
+        if course_info is None:
+            # 空堂
             course_node = CourseNode(
                 time=streak_time,
-                is_free=False,
-                subject=course_info.subject,
-                teachers={teacher_name: teacher_nodes[teacher_name]},
+                is_free=True,
+                subject="",
+                teachers={},
                 classes={class_code: class_nodes[class_code]}
             )
-            final_course_nodes_set.add(course_node)
-        else:
-            # 這是教師課程
-            teacher_name = source
-            if course_info is None:
-                # 空堂
-                course_node = CourseNode(
-                    time=streak_time,
-                    is_free=True,
-                    subject="",
-                    teachers={teacher_name: teacher_nodes[teacher_name]},
-                    classes={}
-                )
-                #logger.debug(f"Adding free teacher course node: {course_node.short()}")
-                final_course_nodes_set.add(course_node)
-               
-    # 更新所有節點的課程資訊
-    for node in final_course_nodes_set:
-        for teacher_name, teacher_node in node.teachers.items():
-            if node.time not in teacher_node.courses:
-                teacher_nodes[teacher_name].courses[node.time] = node
-        for class_code, class_node in node.classes.items():
-            if node.teachers is None:
-                #print(f"Warning: {node} has no teachers, this may be a problem.")
-                #logger.warning(f"hi")
-                pass
-            if node.time not in class_node.courses:
-                class_nodes[class_code].courses[node.time] = node
+            #print()
+            #logger.debug(f"Adding free class course node: {course_node.short()}")
+            # 建立節點時即連結到班級（同一時段先建立者優先）
+            class_nodes[class_code].courses.setdefault(streak_time, course_node)
+            continue
+            
+        # 處理有課程資訊的情況
+        counter_parts = course_info.counterpart
+        if not counter_parts:
+            # 這節有課但沒老師
+            continue
+        if len(counter_parts) != 1:
+            # 多老師或多班級或無班級或無老師
+            continue
+        # 名稱與科目在數千個節點間重複出現，駐留後共用同一字串物件
+        teacher_name = sys.intern(counter_parts[0].participant)
+        counter_log: CourseInfo = teacher_logs.get((teacher_name, streak_time.weekday, streak_time.period))
+        if counter_log is None:
+            # 沒有對應的老師課程
+            continue
+        counter_counterpart = counter_log.counterpart
+        if counter_counterpart is None:
+            # 對應的老師沒有紀錄課程
+            #print(f"{counter_log} has no counterpart for {streak_time}")
+            #print(f"Warning: {teacher_name} has no counterpart in log_dict for {streak_time}")
+            continue
+        if len(counter_counterpart) != 1:
+            # 多老師或多班級或無班級或無老師
+            continue
+        if counter_counterpart[0].participant != class_code or counter_log.subject != course_info.subject:
+            # 班級或科目不對
+            continue
+        
+        course_node = CourseNode(
+            time=streak_time,
+            is_free=False,
+            subject=sys.intern(course_info.subject),
+            teachers={teacher_name: teacher_nodes[teacher_name]},
+            classes={class_code: class_nodes[class_code]}
+        )
+        teacher_nodes[teacher_name].courses.setdefault(streak_time, course_node)
+        class_nodes[class_code].courses.setdefault(streak_time, course_node)
+
+    # 教師空堂
+    for teacher_name, streak_time in free_teacher_slots:
+        course_node = CourseNode(
+            time=streak_time,
+            is_free=True,
+            subject="",
+            teachers={teacher_name: teacher_nodes[teacher_name]},
+            classes={}
+        )
+        teacher_nodes[teacher_name].courses.setdefault(streak_time, course_node)
+
+
+# 一天最多的節次，用於預先建立課程開始點索引
+MAX_PERIOD = 8
+
+
+def build_streak_start_index(teacher_nodes: Dict[str, TeacherNode]) -> Dict[Tuple[str, int, int], CourseNode]:
+    """預先計算 (教師, 星期, 節次) 對應的課程開始點
+
+    結果與 Scheduling.find_streak_start 由該節往前找到的第一個課程相同，
+    查詢時只需一次字典查找。
+    """
+    index: Dict[Tuple[str, int, int], CourseNode] = {}
+    for teacher_name, teacher in teacher_nodes.items():
+        by_weekday: Dict[int, list] = {}
+        for time, node in teacher.courses.items():
+            by_weekday.setdefault(time.weekday, []).append((time.period, node))
+        for weekday, items in by_weekday.items():
+            items.sort(key=lambda item: item[0])
+            # 每個課程負責從自己的節次到下一個課程前一節
+            ends = [period for period, _ in items[1:]] + [max(MAX_PERIOD, items[-1][0]) + 1]
+            for (period, node), end in zip(items, ends):
+                for p in range(period, end):
+                    index[(teacher_name, weekday, p)] = node
+    return index
 
 
 class NodeDicts:
     def __init__(self):
         self.teacher_nodes = None
         self.class_nodes = None
+        self.streak_start_index: Dict[Tuple[str, int, int], CourseNode] = {}
+        # fetch_course_node 的查詢結果，鍵為 (teacher_name, weekday, period, ignore_condition)
+        self.course_node_cache: Dict[Tuple[str, int, int, bool], CourseNode] = {}
 
-    async def fetch_teacher_nodes(self, refresh: bool = False) -> TeacherNodeDict:
+    async def fetch_teacher_nodes(self, refresh: bool = False, index: Optional[Index] = None) -> TeacherNodeDict:
         if not self.teacher_nodes or refresh:
-            self.teacher_nodes = await TeacherNodeDict.fetch(refresh=refresh)
+            self.teacher_nodes = await TeacherNodeDict.fetch(refresh=refresh, index=index)
         return self.teacher_nodes
 
-    async def fetch_class_nodes(self, refresh: bool = False) -> ClassNodeDict:
+    async def fetch_class_nodes(self, refresh: bool = False, index: Optional[Index] = None) -> ClassNodeDict:
         """初始化 class nodes"""
         # 從全域的 index 中取出班級資料
         if not self.class_nodes or refresh:
-            self.class_nodes = await ClassNodeDict.fetch(refresh=refresh) 
+            self.class_nodes = await ClassNodeDict.fetch(refresh=refresh, index=index) 
         return self.class_nodes
     
     @classmethod
@@ -273,22 +302,53 @@ class NodeDicts:
         
         Args:
             log_dict: 課表時段紀錄字典，如果不提供則會從快取獲取
+            refresh: 是否重新建立，預設為 False
             
         Returns:
-            NodeDicts: 包含所有節點的實例
+            NodeDicts: 包含所有節點的實例；未提供 log_dict 且不 refresh 時回傳快取的實例
         """
+        global _node_dicts
+        use_cache = log_dict is None and not refresh
+        if use_cache and _node_dicts is not None:
+            return _node_dicts
+
+        loop = asyncio.get_running_loop()
+        lock = _node_dicts_locks.get(loop)
+        if lock is None:
+            # 只保留目前迴圈的鎖，舊迴圈的鎖隨之釋放
+            _node_dicts_locks.clear()
+            lock = _node_dicts_locks[loop] = asyncio.Lock()
+
+        async with lock:
+            # 等待鎖期間可能已由其他呼叫建好
+            if use_cache and _node_dicts is not None:
+                return _node_dicts
+            _node_dicts = await cls._build(log_dict, refresh=refresh)
+            return _node_dicts
+
+    @classmethod
+    async def _build(cls, log_dict: Optional[TimetableSlotLogDict], refresh: bool) -> "NodeDicts":
         instance = cls()
-        
+        from tnfsh_timetable_core import TNFSHTimetableCore
+        core = TNFSHTimetableCore()
+
+        # 索引只取一次，教師與班級節點（及課表時段紀錄）並行準備；節點都已快取時不需要索引
+        index = None
+        if refresh or _teacher_node_dict is None or _class_node_dict is None:
+            index = await core.fetch_index()
+        tasks = [
+            instance.fetch_teacher_nodes(refresh=refresh, index=index),
+            instance.fetch_class_nodes(refresh=refresh, index=index),
+        ]
         if (log_dict is None) or refresh:
             # 如果沒有提供 log_dict，則從快取獲取
-            from tnfsh_timetable_core import TNFSHTimetableCore
-            core = TNFSHTimetableCore()
-            log_dict = await core.fetch_timetable_slot_log_dict(refresh=refresh)
-            
-        await instance.fetch_teacher_nodes(refresh=refresh)
-        #print(f"teacher_nodes: {instance.teacher_nodes}")
-        await instance.fetch_class_nodes(refresh=refresh)
+            tasks.append(core.fetch_timetable_slot_log_dict(refresh=refresh))
+            _, _, log_dict = await asyncio.gather(*tasks)
+        else:
+            await asyncio.gather(*tasks)
+
+        # 建立課程節點需等教師與班級節點都準備好
         await build_course_node_from_log_dict(log_dict)
-        #print(f"build!")
+        instance.streak_start_index = build_streak_start_index(instance.teacher_nodes.root)
         return instance
 
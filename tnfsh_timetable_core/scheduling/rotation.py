@@ -1,16 +1,12 @@
+"""實作課程輪調的搜尋演算法"""
 from __future__ import annotations
 
-"""實作課程輪調的搜尋演算法"""
 from typing import TYPE_CHECKING, List, Set, Optional, Generator
-from tnfsh_timetable_core.scheduling.utils import connect_neighbors, get_1_hop, is_free, get_neighbors
+from tnfsh_timetable_core.scheduling.utils import is_free, make_1_hop_cache, make_neighbors_cache
+from tnfsh_timetable_core.utils.logger import get_logger
 
 if TYPE_CHECKING:
-    from tnfsh_timetable_core.scheduling.models import TeacherNode, CourseNode
-import logging
-from typing import Generator, List, Set, Optional
-from tnfsh_timetable_core.scheduling.models import CourseNode
-from tnfsh_timetable_core.scheduling.utils import get_neighbors, get_1_hop, is_free
-from tnfsh_timetable_core.utils.logger import get_logger
+    from tnfsh_timetable_core.scheduling.models import CourseNode
 
 logger = get_logger(logger_level="DEBUG")
 
@@ -24,7 +20,10 @@ def rotation(start: CourseNode, max_depth: int = 10) -> Generator[List[CourseNod
     Returns:
         Generator[List[CourseNode], None, None]: 生成找到的所有環路，每個環路是一個 CourseNode 列表
     """
-    max_depth = max_depth
+    # 同一次搜尋內重複的 (current, next) 組合不必重新計算
+    get_1_hop = make_1_hop_cache()
+    get_neighbors = make_neighbors_cache()
+
     def dfs_cycle(
         start: CourseNode,
         current: Optional[CourseNode] = None,
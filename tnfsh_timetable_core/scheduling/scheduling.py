@@ -1,17 +1,18 @@
 from __future__ import annotations
-from ast import Await
-from token import OP
 from typing import TYPE_CHECKING, List, Set, Optional, Generator, Literal, Union
 
+from tnfsh_timetable_core.scheduling.models import NodeDicts
+from tnfsh_timetable_core.scheduling.rotation import rotation
+from tnfsh_timetable_core.scheduling.swap import merge_paths
+from tnfsh_timetable_core.timetable_slot_log_dict.models import StreakTime
 
 if TYPE_CHECKING:
     from tnfsh_timetable_core.scheduling.models import CourseNode
-    from tnfsh_timetable_core.timetable_slot_log_dict.models import StreakTime
     from tnfsh_timetable_core.scheduling.models import TeacherNode
     from tnfsh_timetable_core.scheduling.models import ClassNode
 
 
-from tnfsh_timetable_core.utils.logger import get_logger
+from tnfsh_timetable_core.utils.logger import get_logger, is_debug_enabled
 logger = get_logger(logger_level="DEBUG")
 
 class Scheduling:
@@ -31,8 +32,6 @@ class Scheduling:
         if max_depth <= 1:       
             raise ValueError("最大搜尋深度必須大於1")
         course_node = await self.fetch_course_node(teacher_name, weekday, period, refresh=refresh)
-        if not course_node:
-            raise ValueError(f"課程節點不存在：{teacher_name} 在 {weekday} 星期 {period} 節")
         return self._origin_rotation(course_node, max_depth=max_depth)
 
     async def swap(self, teacher_name: str, weekday: int, period: int, max_depth: int = 3, refresh: bool = False):
@@ -52,39 +51,43 @@ class Scheduling:
         if max_depth <= 0:
             raise ValueError("最大搜尋深度必須大於0")
         course_node = await self.fetch_course_node(teacher_name, weekday, period, refresh=refresh)
-        if not course_node:
-            raise ValueError(f"課程節點不存在：{teacher_name} 在 {weekday} 星期 {period} 節")
-
         return self._origin_swap(course_node, max_depth=max_depth)
 
     def _origin_rotation(self, start: CourseNode, max_depth: int = 10) -> Generator[List[CourseNode], None, None]:
-        from tnfsh_timetable_core.scheduling.rotation import rotation
         return rotation(start, max_depth=max_depth)
 
     def _origin_swap(self, start: CourseNode, max_depth: int = 10) -> Generator[List[CourseNode], None, None]:
-        from tnfsh_timetable_core.scheduling.swap import merge_paths
         return merge_paths(start, max_depth=max_depth)
 
     async def fetch_course_node(self, teacher_name: str, weekday: int, period: int, refresh: bool = False, ignore_condition: bool = False) -> CourseNode:
-        """從教師名稱、星期幾和第幾節獲取課程節點"""
+        """從教師名稱、星期幾和第幾節獲取課程節點，找不到時拋出 ValueError"""
+        node_dicts = await NodeDicts.fetch(refresh=refresh)
+        # 快取跟著節點圖走，圖重建後自然失效
+        key = (teacher_name, weekday, period, ignore_condition)
+        if not refresh and (cached := node_dicts.course_node_cache.get(key)) is not None:
+            return cached
+
         if not ignore_condition and not await self._check_course_valid(teacher_name, weekday, period, refresh=refresh):
             raise ValueError(f"無效的課程資訊：{teacher_name} 在 {weekday} 星期 {period} 節")
                 
-        from tnfsh_timetable_core.scheduling.models import NodeDicts
-        from tnfsh_timetable_core.timetable_slot_log_dict.models import StreakTime
         # Todo: streak要用算的
         streak_time = StreakTime(weekday=weekday, period=period, streak=1)
-        node_dicts = await NodeDicts.fetch(refresh=refresh)
 
         if not node_dicts.teacher_nodes:
             raise ValueError("教師節點字典為空")
             
         teacher = node_dicts.teacher_nodes.root.get(teacher_name, None)
-        if not teacher:
+        if teacher is None:
             available_teachers = list(node_dicts.teacher_nodes.root.keys())
             raise ValueError(f"找不到教師：{teacher_name}。可用的教師：{available_teachers}")
             
-        course_node = self.find_streak_start(teacher, streak_time)
+        course_node = node_dicts.streak_start_index.get((teacher_name, weekday, period))
+        if course_node is None:
+            # 索引未涵蓋的節次，退回逐節往前搜尋
+            course_node = self.find_streak_start(teacher, streak_time)
+        if course_node is None:
+            raise ValueError(f"課程節點不存在：{teacher_name} 在 {weekday} 星期 {period} 節")
+        node_dicts.course_node_cache[key] = course_node
             
         return course_node
     
@@ -93,19 +96,15 @@ class Scheduling:
         time = streak_time
         courses = node.courses
 
-        from tnfsh_timetable_core.timetable_slot_log_dict.models import StreakTime
-
+        weekday, streak = time.weekday, time.streak
         for i in range(time.period, 0, -1):
-            candidate = courses.get(StreakTime(
-                weekday=time.weekday,
-                period=i,
-                streak=time.streak
-            ))
-    
-            if candidate:    
+            candidate = courses.get(StreakTime(weekday=weekday, period=i, streak=streak))
+            if candidate is not None:
                 return candidate
     
-        logger.debug(f"沒有找到開始點：{node.short()} 在 {streak_time}")
+        # 教師/班級節點的 short() 需序列化所有時段，僅在需要輸出時才計算
+        if is_debug_enabled(logger):
+            logger.debug("沒有找到開始點：%s 在 %s", node.short(), streak_time)
 
         return None
     
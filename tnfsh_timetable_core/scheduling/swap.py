@@ -2,10 +2,9 @@
 from typing import Generator, List, Set
 from tnfsh_timetable_core.scheduling.models import TeacherNode, CourseNode
 from tnfsh_timetable_core.scheduling.utils import (
-    connect_neighbors,
     get_1_hop,
-    get_neighbors,
-    is_free
+    is_free,
+    make_neighbors_cache
 )
 from tnfsh_timetable_core.utils.logger import get_logger
 
@@ -26,6 +25,8 @@ def merge_paths(start: CourseNode, max_depth: int=20) -> Generator[List[CourseNo
         List[CourseNode]: 完整的交換路徑（後向路徑 + 起點 + 前向路徑）
     """
     max_depth = max_depth - 1
+    get_neighbors = make_neighbors_cache()
+
     def _dfs_swap_path(
         start: CourseNode,
         current: CourseNode | None = None,
@@ -1,34 +1,15 @@
 from __future__ import annotations
 
-from tkinter import S
-from typing import TYPE_CHECKING, List, Dict, Literal, Set, Optional
+from typing import TYPE_CHECKING, Callable, List, Dict, Literal, Set, Optional, Tuple
 
-from requests import get
+from tnfsh_timetable_core.timetable_slot_log_dict.models import StreakTime
 
 if TYPE_CHECKING:
     from tnfsh_timetable_core.scheduling.models import CourseNode, ClassNode, TeacherNode
-    from tnfsh_timetable_core.timetable_slot_log_dict.models import StreakTime
 
-from tnfsh_timetable_core.utils.logger import get_logger
+from tnfsh_timetable_core.utils.logger import get_logger, is_debug_enabled
 logger = get_logger(logger_level="DEBUG")
 
-# deprecated
-def connect_neighbors(nodes: List[CourseNode]) -> None:
-    """連接課程節點，使每個節點都成為其他節點的鄰居
-    
-    Args:
-        nodes: 需要互相連接的課程節點列表
-    """
-    for course in nodes:
-        course.neighbors = course.neighbors + [
-            n for n in nodes 
-            if (
-                n is not course
-                and not 
-                n in course.neighbors
-            )
-        ]
-
 def is_valid_course_node(course: CourseNode) -> bool:
     condition = (
         len(course.teachers) <= 1 and
@@ -45,7 +26,7 @@ def get_neighbors(course: CourseNode) -> List[CourseNode]:
     Returns:
         List[CourseNode]: 課程節點的所有鄰居
     """
-    src_class = list(course.classes.values())[0]
+    src_class = course.primary_class
     return list(src_class.courses.values()) # 取得所有課程節點
 
 def is_free(
@@ -81,41 +62,39 @@ def find_streak_start_if_free(course: CourseNode, streak_time: StreakTime = None
     if streak_time is None:
         # 如果沒有提供 streak_time，則使用課程的時間
         if not course.time:
-            logger.debug(f"課程 {course.short()} 沒有時間資訊")
+            if is_debug_enabled(logger):
+                logger.debug("課程 %s 沒有時間資訊", course.short())
             return None
         time = course.time
 
 
     if type == "teacher":
         # 如果是教師節點，則使用教師的課程
-        src_class = list(course.teachers.values())[0]
+        src_class = course.primary_teacher
 
     elif type == "class":
         # 如果是班級節點，則使用班級的課程
-        src_class = list(course.classes.values())[0]
-
-    from tnfsh_timetable_core.timetable_slot_log_dict.models import StreakTime
+        src_class = course.primary_class
 
+    courses = src_class.courses
+    weekday, streak = time.weekday, time.streak
     for i in range(time.period, 0, -1):
-        candidate = src_class.courses.get(StreakTime(
-            weekday=time.weekday,
-            period=i,
-            streak=time.streak
-        ))
-        
+        candidate = courses.get(StreakTime(weekday=weekday, period=i, streak=streak))
 
-        if candidate and candidate.is_free:
+        if candidate is not None and candidate.is_free:
             if candidate.time.streak >= (time.period - i) + time.streak:
-                logger.debug(f"找到空堂開始點：{candidate.short()}")
+                if is_debug_enabled(logger):
+                    logger.debug("找到空堂開始點：%s", candidate.short())
                 return candidate
             else:
-                logger.debug(f"找到空堂開始點 {candidate.short()} 但streak不足")
+                if is_debug_enabled(logger):
+                    logger.debug("找到空堂開始點 %s 但streak不足", candidate.short())
                 return None
     
     if type == "class":
-        logger.debug(f"在 {src_class.class_code} 中找不到空堂開始點")
+        logger.debug("在 %s 中找不到空堂開始點", src_class.class_code)
     elif type == "teacher":
-        logger.debug(f"在 {src_class.teacher_name} 中找不到空堂開始點")
+        logger.debug("在 %s 中找不到空堂開始點", src_class.teacher_name)
     return None
 
 def get_1_hop(
@@ -154,7 +133,7 @@ def get_1_hop(
     if freed is None:
         freed = set()
 
-    src_teacher = list(src.teachers.values())[0]
+    src_teacher = src.primary_teacher
     dst_time = dst.time
     src_courses = src_teacher.courses
 
@@ -162,7 +141,7 @@ def get_1_hop(
     hop_1 = src_courses.get(dst_time, None)
     
     if hop_1 is None:
-        logger.debug(f"Warning: {src_teacher.teacher_name}在 {dst_time} 找不到課程節點")
+        logger.debug("Warning: %s在 %s 找不到課程節點", src_teacher.teacher_name, dst_time)
         # 找到中段
         candidate = find_streak_start_if_free(src, streak_time=dst_time, type="teacher")
         if candidate:
@@ -171,12 +150,12 @@ def get_1_hop(
                 # 往前搜尋 streak 開始
                     return candidate
             else:
-                logger.debug(f"Warning: {src_teacher.teacher_name}在 {dst_time} 找到中段但不為空堂")
+                logger.debug("Warning: %s在 %s 找到中段但不為空堂", src_teacher.teacher_name, dst_time)
                 # 找到中段且不為空堂
                 return None
         else:
             # 找不到中段的頭 或 streak 不合
-            logger.debug(f"Warning: {src_teacher.teacher_name}在 {dst_time} 找不到中段的頭或streak不合")
+            logger.debug("Warning: %s在 %s 找不到中段的頭或streak不合", src_teacher.teacher_name, dst_time)
             return None
     else:
         # 找到頭
@@ -186,12 +165,66 @@ def get_1_hop(
                 return hop_1 
             else:
                 # 找到頭但streak不足
-                logger.debug(f"Warning: {src_teacher.teacher_name}在 {dst_time} 找到頭但streak不足")
+                logger.debug("Warning: %s在 %s 找到頭但streak不足", src_teacher.teacher_name, dst_time)
                 return None
         else:
             # 找到頭且不為空堂
             if hop_1.time.streak == dst_time.streak:
                 return hop_1
             else:
-                logger.debug(f"Warning: {src_teacher.teacher_name}在 {dst_time} 找到頭但不為空堂")
-                return None       
\ No newline at end of file
+                logger.debug("Warning: %s在 %s 找到頭但不為空堂", src_teacher.teacher_name, dst_time)
+                return None
+
+
+def make_1_hop_cache() -> Callable[..., Optional[CourseNode]]:
+    """建立單次搜尋使用的 get_1_hop 快取
+
+    rotation 的 DFS 會從不同路徑重複檢查同一組 (src, dst)，以節點身分、方向與模式為鍵快取；
+    搜尋期間節點不會被回收，id 不會重複。
+    freed 非空時結果可能隨已釋放的節點而不同，直接呼叫 get_1_hop 不經快取，
+    因此 swap（每層都帶 freed）不使用此快取。
+
+    Returns:
+        Callable: 與 get_1_hop 參數相同的函式
+    """
+    cache: Dict[Tuple[int, int, str, str], Optional[CourseNode]] = {}
+
+    def cached_get_1_hop(
+            src: CourseNode,
+            dst: CourseNode,
+            *,
+            type: Literal["fwd", "bwd"],
+            mode: Literal["rotation", "swap"] = "rotation",
+            freed: Optional[Set[CourseNode]] = None
+    ) -> Optional[CourseNode]:
+        if freed:
+            return get_1_hop(src, dst, type=type, mode=mode, freed=freed)
+        key = (id(src), id(dst), type, mode)
+        try:
+            return cache[key]
+        except KeyError:
+            result = cache[key] = get_1_hop(src, dst, type=type, mode=mode, freed=freed)
+            return result
+
+    return cached_get_1_hop
+
+
+def make_neighbors_cache() -> Callable[[CourseNode], Tuple[CourseNode, ...]]:
+    """建立單次搜尋使用的 get_neighbors 快取
+
+    搜尋期間班級課程不會變動，同一節點的鄰居只需取出一次；
+    以 tuple 回傳，呼叫端只需迭代。
+
+    Returns:
+        Callable: 與 get_neighbors 參數相同的函式
+    """
+    cache: Dict[int, Tuple[CourseNode, ...]] = {}
+
+    def cached_get_neighbors(course: CourseNode) -> Tuple[CourseNode, ...]:
+        try:
+            return cache[id(course)]
+        except KeyError:
+            result = cache[id(course)] = tuple(get_neighbors(course))
+            return result
+
+    return cached_get_neighbors
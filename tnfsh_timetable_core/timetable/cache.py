@@ -1,6 +1,10 @@
-from typing import Dict
+from collections import OrderedDict
+from typing import Dict, Optional, Set
 from pathlib import Path
-import json
+import asyncio
+import functools
+import os
+from pydantic import ValidationError
 from tnfsh_timetable_core.timetable.models import TimeTable
 from tnfsh_timetable_core.utils.logger import get_logger
 
@@ -9,36 +13,75 @@ from tnfsh_timetable_core.utils.logger import get_logger
 logger = get_logger(logger_level="INFO")
 
 
+# 記憶體快取的容量上限，大於全校班級與教師數，預載入全部課表時不會互相淘汰
+PREBUILT_CACHE_MAXSIZE = 1024
+
+
+class _LRUDict(OrderedDict):
+    """有容量上限的 dict：讀寫時移到最後，超過上限時淘汰最久未使用的項目"""
+
+    def __init__(self, *args, maxsize: int = PREBUILT_CACHE_MAXSIZE, **kwargs):
+        self.maxsize = maxsize
+        super().__init__(*args, **kwargs)
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+    def copy(self) -> "_LRUDict":
+        # 以 items() 複製，避免逐鍵讀取時 __getitem__ 改動來源的順序
+        return type(self)(self.items(), maxsize=self.maxsize)
+
+    def __reduce__(self):
+        # 先建立相同容量的空 dict 再放回項目，還原時不會以預設容量淘汰
+        return (functools.partial(type(self), maxsize=self.maxsize), (), None, None, iter(self.items()))
+
+
 # 第一層：記憶體快取
-prebuilt_cache: Dict[str, TimeTable] = {} # str: Teacher name or class code
+prebuilt_cache: Dict[str, TimeTable] = _LRUDict(maxsize=PREBUILT_CACHE_MAXSIZE) # str: Teacher name or class code
+
+# 進行中的網路請求；同一目標同時被要求時，後到者等待同一個 Future，不重複抓取
+_inflight: Dict[str, "asyncio.Future[TimeTable]"] = {}
+
+
+class _InflightCancelled(Exception):
+    """負責抓取的請求被取消；等待同一個 Future 的請求應自行重試"""
 
 # 第二層：本地 JSON 快取目錄
 CACHE_DIR = Path(__file__).resolve().parent / "cache"
 CACHE_DIR.mkdir(exist_ok=True)
 
-def load_from_disk(target: str) -> dict:
-    """從磁碟載入快取的課表資料。
+def load_table_from_disk(target: str) -> Optional[TimeTable]:
+    """從磁碟載入快取的課表物件。
+
+    由 pydantic-core 直接解析 JSON 位元組，不先經過 json.load 建立中介 dict。
 
     Args:
         target: 目標班級代號
 
     Returns:
-        dict: 快取的課表資料，如果載入失敗則返回空字典
+        Optional[TimeTable]: 快取的課表，如果不存在或無效則返回 None
     """
     path = CACHE_DIR / f"prebuilt_{target}.json"
     try:
         if path.exists() and path.stat().st_size > 0:
-            with open(path, encoding="utf-8") as f:
-                data = json.load(f)
-                logger.debug(f"成功從 {path} 載入快取資料")  # 改為 debug 層級
-                return data
+            table = TimeTable.model_validate_json(path.read_bytes())
+            logger.debug(f"成功從 {path} 載入快取資料")
+            return table
         else:
-            logger.debug(f"快取檔案 {path} 不存在或為空")  # 改為 debug 層級
-    except json.JSONDecodeError as e:
-        logger.error(f"快取檔案 {path} JSON 格式無效: {e}")  # 保留 error 層級
+            logger.debug(f"快取檔案 {path} 不存在或為空")
+    except ValidationError as e:
+        logger.error(f"快取檔案 {path} 內容無效: {e}")
     except Exception as e:
-        logger.error(f"讀取快取檔案 {path} 時發生錯誤: {e}")  # 保留 error 層級
-    return {}
+        logger.error(f"讀取快取檔案 {path} 時發生錯誤: {e}")
+    return None
 
 def save_to_disk(target: str, table: TimeTable) -> bool:
     """將課表資料儲存到磁碟快取。
@@ -52,15 +95,40 @@ def save_to_disk(target: str, table: TimeTable) -> bool:
     """
     path = CACHE_DIR / f"prebuilt_{target}.json"
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json_data = table.model_dump_json(indent=4)
-            f.write(json_data)
-            logger.debug(f"成功將資料儲存至 {path}")  # 改為 debug 層級
-            return True
+        # 快取檔不需人工閱讀，不縮排以減少序列化時間與檔案大小
+        path.write_text(table.model_dump_json(), encoding="utf-8")
+        logger.debug(f"成功將資料儲存至 {path}")  # 改為 debug 層級
+        return True
     except Exception as e:
         logger.error(f"儲存資料至 {path} 時發生錯誤: {e}")  # 保留 error 層級
         return False
 
+def list_cached_targets() -> Set[str]:
+    """列出磁碟上已有非空快取檔的目標
+
+    以 os.scandir 一次列出快取目錄，不逐一開檔解析 JSON。
+
+    Returns:
+        Set[str]: 已有快取的目標名稱
+    """
+    prefix, suffix = "prebuilt_", ".json"
+    with os.scandir(CACHE_DIR) as entries:
+        return {
+            entry.name[len(prefix):-len(suffix)]
+            for entry in entries
+            if entry.name.startswith(prefix) and entry.name.endswith(suffix)
+            and entry.is_file() and entry.stat().st_size > 0
+        }
+
+async def aload_table_from_disk(target: str) -> Optional[TimeTable]:
+    """在執行緒中呼叫 load_table_from_disk"""
+    return await asyncio.to_thread(load_table_from_disk, target)
+
+async def asave_to_disk(target: str, table: TimeTable) -> bool:
+    """在執行緒中呼叫 save_to_disk，寫檔時不阻塞其他下載"""
+    return await asyncio.to_thread(save_to_disk, target, table)
+
+
 
 async def preload_all(
     only_missing: bool = True,
@@ -77,7 +145,6 @@ async def preload_all(
     """
 
     from tnfsh_timetable_core.index.index import Index
-    import asyncio
 
     index = Index()
     await index.fetch()
@@ -89,23 +156,35 @@ async def preload_all(
     targets = list(index.reverse_index.keys())
     logger.info(f"🔄 開始預載入所有課表，共 {len(targets)} 項，延遲：{delay} 秒，併發上限：{max_concurrent}")
 
-    semaphore = asyncio.Semaphore(max_concurrent)
+    if only_missing:
+        # 先一次找出已有快取的目標，實際內容待需要時才載入
+        cached_on_disk = await asyncio.to_thread(list_cached_targets)
+        skipped = {t for t in targets if t in prebuilt_cache or t in cached_on_disk}
+        if skipped:
+            logger.debug(f"⚡ 快取已存在，略過 {len(skipped)} 項")
+            targets = [t for t in targets if t not in skipped]
 
     async def process(target: str):
-        if only_missing and (target in prebuilt_cache or load_from_disk(target)):
-            logger.debug(f"⚡ 快取已存在，略過：{target}")
-            return
-        async with semaphore:
-            try:
-                logger.debug(f"➡️ 開始預載入：{target}")
-                if delay > 0:
-                    await asyncio.sleep(delay)  # ✅ 模擬延遲
-                await TimeTable.fetch_cached(target)
-                logger.debug(f"✅ 預載入成功：{target}")
-            except Exception as e:
-                logger.error(f"❌ 預載入失敗 {target}: {e}")
-
-    await asyncio.gather(*(process(t) for t in targets))
+        try:
+            logger.debug(f"➡️ 開始預載入：{target}")
+            if delay > 0:
+                await asyncio.sleep(delay)  # ✅ 模擬延遲
+            await TimeTable.fetch_cached(target)
+            logger.debug(f"✅ 預載入成功：{target}")
+        except Exception as e:
+            logger.error(f"❌ 預載入失敗 {target}: {e}")
+
+    # 固定數量的 worker 共用同一個佇列，同時存在的協程數即為併發上限，
+    # 不必一次為每個目標建立協程
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for target in targets:
+        queue.put_nowait(target)
+
+    async def worker():
+        while not queue.empty():
+            await process(queue.get_nowait())
+
+    await asyncio.gather(*(worker() for _ in range(min(max_concurrent, len(targets)))))
     logger.info("🏁 預載入完成")
 
 
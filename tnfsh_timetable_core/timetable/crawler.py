@@ -5,6 +5,7 @@ from aiohttp import client_exceptions
 import asyncio
 from bs4 import BeautifulSoup
 import json
+import re
 
 from tnfsh_timetable_core.index.index import Index
 from tnfsh_timetable_core.utils.logger import get_logger
@@ -39,6 +40,22 @@ class RawParsedResult(TypedDict):
 
 from tnfsh_timetable_core.index.models import ReverseIndexResult
 
+# 移除換行字元用的轉換表
+_REMOVE_LINE_BREAKS = str.maketrans("", "", "\r\n")
+
+# 節次時間格式，例如 "0810" -> "08:10"
+_PERIOD_TIME_PATTERN = re.compile(r'(\d{2})(\d{2})')
+
+def format_period_time(text: str) -> str:
+    """將節次時間轉為 HH:MM 格式
+
+    課表上的時間幾乎都是四位數字（如 "0810"），直接以切片處理，
+    其他格式才交給正規表達式。
+    """
+    if len(text) == 4 and text.isdigit():
+        return f"{text[:2]}:{text[2:]}"
+    return _PERIOD_TIME_PATTERN.sub(r'\1:\2', text)
+
 def resolve_target(
     target: str,
     reverse_index: ReverseIndexResult,
@@ -124,36 +141,36 @@ async def fetch_raw_html(target: str, refresh: bool = False, max_retries: int =
 
         except client_exceptions.ClientResponseError as e:
             error_msg = f"HTTP 狀態碼錯誤 {e.status}: {e.message}"
-            logger.warning(f"⚠️ {error_msg}")
+            logger.warning("⚠️ %s", error_msg)
             if attempt + 1 < max_retries:
-                logger.info(f"🔄 等待 {retry_delay} 秒後重試...")
+                logger.info("🔄 等待 %s 秒後重試...", retry_delay)
                 await asyncio.sleep(retry_delay)
             else:
                 raise FetchError(error_msg)
 
         except client_exceptions.ClientConnectorError as e:
             error_msg = f"連線錯誤：{str(e)}"
-            logger.warning(f"⚠️ {error_msg}")
+            logger.warning("⚠️ %s", error_msg)
             if attempt + 1 < max_retries:
-                logger.info(f"🔄 等待 {retry_delay} 秒後重試...")
+                logger.info("🔄 等待 %s 秒後重試...", retry_delay)
                 await asyncio.sleep(retry_delay)
             else:
                 raise FetchError(error_msg)
 
         except (client_exceptions.ServerTimeoutError, asyncio.TimeoutError):
             error_msg = "請求超時"
-            logger.warning(f"⚠️ {error_msg}")
+            logger.warning("⚠️ %s", error_msg)
             if attempt + 1 < max_retries:
-                logger.info(f"🔄 等待 {retry_delay} 秒後重試...")
+                logger.info("🔄 等待 %s 秒後重試...", retry_delay)
                 await asyncio.sleep(retry_delay)
             else:
                 raise FetchError(error_msg)
 
         except client_exceptions.ClientError as e:
             error_msg = f"網路請求錯誤：{str(e)}"
-            logger.warning(f"⚠️ {error_msg}")
+            logger.warning("⚠️ %s", error_msg)
             if attempt + 1 < max_retries:
-                logger.info(f"🔄 等待 {retry_delay} 秒後重試...")
+                logger.info("🔄 等待 %s 秒後重試...", retry_delay)
                 await asyncio.sleep(retry_delay)
             else:
                 raise FetchError(error_msg)
@@ -201,17 +218,14 @@ def parse_html(soup: BeautifulSoup) -> RawParsedResult:
 
     logger.debug("📊 解析課表時間")
     # 擷取 periods
-    import re
-    re_pattern = r'(\d{2})(\d{2})'
-    re_sub = r'\1:\2'
     periods: Dict[str, Tuple[str, str]] = {}
     for row in main_table.find_all("tr"):
         cells = row.find_all("td")
         if len(cells) < 2:
             continue
-        lesson_name = cells[0].text.replace("\n", "").replace("\r", "")
-        time_text = cells[1].text.replace("\n", "").replace("\r", "")
-        times = [re.sub(re_pattern, re_sub, t.replace(" ", "")) for t in time_text.split("｜")]
+        lesson_name = cells[0].text.translate(_REMOVE_LINE_BREAKS)
+        time_text = cells[1].text.translate(_REMOVE_LINE_BREAKS)
+        times = [format_period_time(t.replace(" ", "")) for t in time_text.split("｜")]
         if len(times) == 2:
             periods[lesson_name] = (times[0], times[1])
 
@@ -1,7 +1,7 @@
 from __future__ import annotations
-from typing import List, Dict, TypeAlias, Optional, Any, Literal, ClassVar
+import asyncio
+from typing import List, Dict, TypeAlias, Optional, Literal
 from datetime import datetime
-import json
 from pydantic import BaseModel
 from tnfsh_timetable_core.timetable.crawler import RawParsedResult
 from tnfsh_timetable_core.utils.logger import get_logger
@@ -108,7 +108,7 @@ class TimeTable(BaseModel):
         1. 記憶體 → 2. 本地檔案 → 3. 網路請求（可透過 refresh 強制重新建立）
         並在 refresh 時同步更新記憶體與本地快取。
         """
-        from tnfsh_timetable_core.timetable.cache import prebuilt_cache, load_from_disk, save_to_disk
+        from tnfsh_timetable_core.timetable.cache import prebuilt_cache, _inflight, _InflightCancelled, aload_table_from_disk, asave_to_disk
 
         key = target
 
@@ -120,27 +120,47 @@ class TimeTable(BaseModel):
         # 層 2：本地 JSON
         if not refresh:
             logger.debug(f"💾 嘗試從本地快取載入：{target}")
-            data = load_from_disk(target)
-            if data:
-                try:
-                    # 嘗試從 JSON 載入資料
-                    instance = cls.model_validate(data)
-                    prebuilt_cache[key] = instance
-                    logger.debug(f"📥 成功從本地快取載入：{target}")
-                    return instance
-                except Exception as e:
-                    logger.error(f"❌ 本地快取資料無效：{target}，錯誤：{e}")
+            # 快取無效時已於讀取時記錄錯誤並返回 None
+            instance = await aload_table_from_disk(target)
+            if instance is not None:
+                prebuilt_cache[key] = instance
+                logger.debug(f"📥 成功從本地快取載入：{target}")
+                return instance
 
         # 層 3：fallback → 網路 request
-        logger.info(f"🌐 從網路抓取課表資料：{target}")
-        instance = await cls._request(target)
-
-        # 同步更新兩層 cache
-        prebuilt_cache[key] = instance
-        save_to_disk(target, instance)
-        logger.debug(f"💾 已更新快取：{target}")
-
-        return instance    
+        # 同一目標已在抓取中時直接等待其結果；shield 避免等待者被取消時連帶取消共用的 Future
+        # 負責抓取的請求被取消時，等待者重新檢查，由其中一個接手抓取
+        while (inflight := _inflight.get(key)) is not None:
+            logger.debug(f"⏳ 等待進行中的請求：{target}")
+            try:
+                return await asyncio.shield(inflight)
+            except _InflightCancelled:
+                logger.debug(f"🔁 進行中的請求已取消，重新嘗試：{target}")
+
+        future: asyncio.Future[TimeTable] = asyncio.get_running_loop().create_future()
+        _inflight[key] = future
+        try:
+            logger.info(f"🌐 從網路抓取課表資料：{target}")
+            instance = await cls._request(target)
+
+            # 同步更新兩層 cache
+            prebuilt_cache[key] = instance
+            await asave_to_disk(target, instance)
+            logger.debug(f"💾 已更新快取：{target}")
+            future.set_result(instance)
+            return instance
+        except asyncio.CancelledError:
+            # 只取消自己；等待者收到可重試的例外，不會被連帶取消
+            future.set_exception(_InflightCancelled(target))
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 標記例外已被取用，沒有其他等待者時不會出現 "exception was never retrieved" 警告
+            future.exception()
+            raise
+        finally:
+            _inflight.pop(key, None)
     
     @classmethod
     async def _request(cls, target: str) -> "TimeTable":
@@ -159,6 +179,5 @@ class TimeTable(BaseModel):
 
 if __name__ == "__main__":
     # For test cases, see: tests/test_timetable/test_models.py
-    import asyncio
     asyncio.run(TimeTable.fetch_cached(target="101", refresh=True))
     pass
\ No newline at end of file
@@ -1,8 +1,7 @@
-import json
+import asyncio
 from typing import List, Optional, Dict, Tuple, TYPE_CHECKING
 from pathlib import Path
-from venv import logger
-from weakref import ref
+from pydantic import TypeAdapter, ValidationError
 from tnfsh_timetable_core.abc.cache_abc import BaseCacheABC
 from tnfsh_timetable_core.timetable_slot_log_dict.models import StreakTime, TimetableSlotLog
 
@@ -20,6 +19,9 @@ Log = Optional["CourseInfo"]
 
 _memory_cache: Optional["TimetableSlotLogDict"] = None
 
+# 檔案快取的讀寫由 pydantic-core 直接處理 JSON 位元組，不經過 json 模組與中介 dict
+_logs_adapter = TypeAdapter(List[TimetableSlotLog])
+
 class TimetableSlotLogCache(BaseCacheABC):        
     def __init__(self, crawler: Optional["TimetableSlotLogCrawler"] = None):
         """初始化 Cache
@@ -78,16 +80,18 @@ class TimetableSlotLogCache(BaseCacheABC):
         return _memory_cache
 
     async def fetch_from_file(self) -> Optional["TimetableSlotLogDict"]:
-        """從本地檔案快取取得資料"""
+        """從本地檔案快取取得資料，讀檔與解析在執行緒中進行，不阻塞事件迴圈"""
+        return await asyncio.to_thread(self._load_file)
+
+    def _load_file(self) -> Optional["TimetableSlotLogDict"]:
+        """同步讀取並解析本地檔案快取"""
         if not self._cache_file.exists():
             return None
         
         try:
-            with open(self._cache_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                logs = [TimetableSlotLog(**item) for item in data]
-                return self._convert_to_dict(logs)
-        except (json.JSONDecodeError, FileNotFoundError):
+            logs = _logs_adapter.validate_json(self._cache_file.read_bytes())
+            return self._convert_to_dict(logs)
+        except (ValidationError, FileNotFoundError):
             return None
 
     async def fetch_from_source(self, refresh: bool = False) -> List[TimetableSlotLog]:
@@ -101,6 +105,9 @@ class TimetableSlotLogCache(BaseCacheABC):
 
     async def save_to_file(self, data: List[TimetableSlotLog]) -> None:
         """儲存資料到本地檔案快取，存成 List[TimetableSlotLog] 格式"""
-        json_data = [item.model_dump() for item in data]
-        with open(self._cache_file, "w", encoding="utf-8") as f:
-            json.dump(json_data, f, ensure_ascii=False, indent=2)
\ No newline at end of file
+        await asyncio.to_thread(self._write_file, data)
+
+    def _write_file(self, data: List[TimetableSlotLog]) -> None:
+        """同步序列化並寫入本地檔案快取"""
+        # 快取檔不需人工閱讀，不縮排
+        self._cache_file.write_bytes(_logs_adapter.dump_json(data))
\ No newline at end of file
@@ -38,7 +38,8 @@ class TimetableSlotLogCrawler(
         result = []
         for timetable in raw:
             source = getattr(timetable, "target", None)
-            
+            # 只需對每份課表判斷一次是否要輸出除錯資訊
+            trace_source = source == "陳婉玲"
 
             for day_index, day in enumerate(timetable.table):
                 
@@ -47,7 +48,7 @@ class TimetableSlotLogCrawler(
                 start_period = 0
 
                 for period_index, course in enumerate(day):
-                    if source == "陳婉玲":
+                    if trace_source:
                         # 顯示時間
                         logger.debug(f"source: {source}, day_index: {day_index}, period_index: {period_index}")
                         if course is None or not isinstance(course, CourseInfo):
@@ -1,26 +1,17 @@
+from dataclasses import dataclass, field
 from pydantic import BaseModel
-from typing import Optional, TYPE_CHECKING
+from typing import Optional
 
 from functools import total_ordering
+# 作為各課表字典的鍵，使用 frozen slots dataclass，雜湊與比較不經過 pydantic
 @total_ordering
-class StreakTime(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class StreakTime:
     weekday: int
     period: int
-    streak: int
+    # ✅ 只根據固定欄位雜湊與比較 即使 streak 不同也能 get 到
+    streak: int = field(compare=False)
 
-    
-
-    def __hash__(self):
-        return hash((self.weekday, self.period))  # ✅ 只根據固定欄位 即使 streak 不同也能 get 到
-
-    def __eq__(self, other):
-        if not isinstance(other, StreakTime):
-            return False
-        return (
-            self.weekday == other.weekday and
-            self.period == other.period
-        )
-    
     def __lt__(self, other):
         if not isinstance(other, StreakTime):
             return NotImplemented
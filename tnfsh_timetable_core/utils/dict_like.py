@@ -1,18 +1,16 @@
 def dict_like(cls):
 
-    def _get_root(self):
-        return self.root
-
-    setattr(cls, '__getitem__', lambda self, k: _get_root(self)[k])
-    setattr(cls, '__setitem__', lambda self, k, v: _get_root(self).__setitem__(k, v))
-    setattr(cls, '__delitem__', lambda self, k: _get_root(self).__delitem__(k))
-    setattr(cls, '__contains__', lambda self, k: k in _get_root(self))
-    setattr(cls, '__iter__', lambda self: iter(_get_root(self)))
-    setattr(cls, '__len__', lambda self: len(_get_root(self)))
-    setattr(cls, 'get', lambda self, k, default=None: _get_root(self).get(k, default))
-    setattr(cls, 'keys', lambda self: _get_root(self).keys())
-    setattr(cls, 'values', lambda self: _get_root(self).values())
-    setattr(cls, 'items', lambda self: _get_root(self).items())
-    setattr(cls, 'update', lambda self, *args, **kwargs: _get_root(self).update(*args, **kwargs))
+    # 直接存取 self.root，省去每次透過 _get_root 多一層函式呼叫
+    setattr(cls, '__getitem__', lambda self, k: self.root[k])
+    setattr(cls, '__setitem__', lambda self, k, v: self.root.__setitem__(k, v))
+    setattr(cls, '__delitem__', lambda self, k: self.root.__delitem__(k))
+    setattr(cls, '__contains__', lambda self, k: k in self.root)
+    setattr(cls, '__iter__', lambda self: iter(self.root))
+    setattr(cls, '__len__', lambda self: len(self.root))
+    setattr(cls, 'get', lambda self, k, default=None: self.root.get(k, default))
+    setattr(cls, 'keys', lambda self: self.root.keys())
+    setattr(cls, 'values', lambda self: self.root.values())
+    setattr(cls, 'items', lambda self: self.root.items())
+    setattr(cls, 'update', lambda self, *args, **kwargs: self.root.update(*args, **kwargs))
     
-    return cls
\ No newline at end of file
+    return cls
@@ -76,3 +76,28 @@ def set_log_level(level: str):
     LOG_LEVEL = level
     handler.setLevel(getattr(logging, LOG_LEVEL))
     logging.getLogger().setLevel(getattr(logging, LOG_LEVEL))
+
+
+def is_debug_enabled(logger: logging.Logger) -> bool:
+    """
+    判斷 DEBUG 訊息是否真的會被輸出
+
+    get_logger 會把 logger 本身設為 DEBUG，實際過濾由 handler 等級負責，
+    因此單看 logger.isEnabledFor 並不足夠，需一併檢查沿途的 handler。
+
+    Args:
+        logger (logging.Logger): 要檢查的 logger
+
+    Returns:
+        bool: 若至少有一個 handler 會輸出 DEBUG 訊息則為 True
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return False
+    current = logger
+    while current is not None:
+        if any(h.level <= logging.DEBUG for h in current.handlers):
+            return True
+        if not current.propagate:
+            break
+        current = current.parent
+    return False